@@ -3,46 +3,23 @@ A voice-based AI interviewer system that conducts job interviews through speech
 This module handles speech recognition, text-to-speech conversion, and interview management.
 """
 
-import json
-from openai import OpenAI
+import asyncio
 import os
-from typing import List, Dict
+from typing import Dict
 import time
-import re
 from gtts import gTTS
 import speech_recognition as sr
 from playsound import playsound
 
-class OpenAIClient:
-    """
-    A wrapper class for OpenAI API interactions.
-    
-    Attributes:
-        client (OpenAI): The OpenAI client instance for API calls.
-    """
-    
-    def __init__(self, api_key, base_url):
-        """
-        Initialize the OpenAI client.
-        
-        Args:
-            api_key (str): API key for authentication
-            base_url (str): Base URL for API endpoints
-        """
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+from background_listener import BackgroundListener
+from interview_engine import AsyncOpenAIClient, InterviewEngine
+from result_store import ResultWriter
+from score_index import ScoreIndex
+from segmented_stt import listen_segmented
+from streaming_tts import PlaybackQueue
 
-    def create_completion(self, model, messages):
-        """
-        Create a chat completion using the OpenAI API.
-        
-        Args:
-            model (str): The model to use for completion
-            messages (list): List of message dictionaries
-            
-        Returns:
-            OpenAI completion response
-        """
-        return self.client.chat.completions.create(model=model, messages=messages)
+# Kept for callers that import the client from here
+OpenAIClient = AsyncOpenAIClient
 
 class VoiceInterface:
     """
@@ -50,13 +27,39 @@ class VoiceInterface:
     
     Attributes:
         recognizer (sr.Recognizer): Speech recognition instance
+        playback (PlaybackQueue): Sentence-level streaming player, or None to
+            synthesize the whole text before playing it
+        listener (BackgroundListener): Session-scoped microphone stream while an
+            interview is running, otherwise None
     """
     
-    def __init__(self):
+    def __init__(self, streaming_tts=True):
+        self.playback = PlaybackQueue(playsound) if streaming_tts else None
+        self.listener = None
         self.recognizer = sr.Recognizer()
         self.recognizer.pause_threshold = 2  # Wait for 2 seconds of silence
         self.recognizer.phrase_threshold = 0.3  # Minimum seconds of speaking to activate
         self.recognizer.non_speaking_duration = 1  # Time of silence to mark the end
+
+    def start_session(self):
+        """
+        Open the microphone and calibrate for ambient noise once for the whole interview.
+        
+        Falls back to opening the microphone on every listen() if the stream cannot be started.
+        """
+        listener = BackgroundListener(self.recognizer, end_pause=self.recognizer.pause_threshold)
+        try:
+            listener.start()
+        except Exception as e:
+            print(f"Could not open a persistent microphone stream: {e}")
+            return
+        self.listener = listener
+
+    def end_session(self):
+        """Close the session's microphone stream, if one is open."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
     
     def speak(self, text):
         """
@@ -66,9 +69,13 @@ class VoiceInterface:
             text (str): Text to be converted to speech
             
         Side effects:
-            Creates and plays a temporary audio file
+            Creates and plays temporary audio files; in streaming mode the first
+            sentence starts playing while the rest are still being synthesized
         """
         try:
+            if self.playback is not None:
+                self.playback.speak(text, lang='en', tld='com')
+                return
             tts = gTTS(text=text, lang='en', tld='com')
             temp_file = "temp_speech.mp3"
             tts.save(temp_file)
@@ -77,10 +84,14 @@ class VoiceInterface:
         except Exception as e:
             print(f"Error in speech synthesis: {e}")
 
-    def listen(self):
+    def listen(self, on_partial=None):
         """
         Listen for and recognize speech input from the user.
         
+        Args:
+            on_partial (callable): Called with the transcript so far while the
+                user is still talking
+        
         Returns:
             str: Recognized text from speech, or None if recognition fails
             
@@ -88,17 +99,23 @@ class VoiceInterface:
             Prints status messages during listening process
         """
         try:
+            if self.listener is not None:
+                print("Listening... (speak your response, I'll wait for you to finish)")
+                text = self.listener.listen_answer(on_partial=on_partial)
+                print(f"You said: {text}")
+                return text
+            
             with sr.Microphone() as source:
                 print("Listening... (speak your response, I'll wait for you to finish)")
                 self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 
-                # Listen until there's a significant pause
-                audio = self.recognizer.listen(source, 
-                                            timeout=None,  # No timeout for starting to speak
-                                            phrase_time_limit=None)  # No limit on response length
+                # Listen until there's a significant pause; chunks split at shorter
+                # pauses are transcribed in parallel while the candidate keeps talking
+                text = listen_segmented(self.recognizer, source,
+                                        end_pause=self.recognizer.pause_threshold,
+                                        on_partial=on_partial)
                 
                 print("Processing your response...")
-                text = self.recognizer.recognize_google(audio)
                 print(f"You said: {text}")
                 return text
                 
@@ -111,223 +128,85 @@ class VoiceInterface:
 
 class InterviewAI:
     """
-    Main class handling the interview process including question generation,
-    response collection, and evaluation.
+    Voice interviewer over the shared InterviewEngine.
+    
+    The microphone and speaker are wired in as the engine's speech hooks; they are
+    blocking devices, so each hook runs its call in a worker thread while the engine's
+    model calls stay on the event loop.
     
     Attributes:
-        client (OpenAIClient): Instance of OpenAIClient for API interactions
+        engine (InterviewEngine): Generates questions, follow-ups and the evaluation
+        voice (VoiceInterface): Microphone and speaker
+        result_writer (ResultWriter): Background writer for result files, created
+            on first use
+        adaptive (bool): Ask a follow-up question after a thin answer
+        max_follow_ups (int): Most follow-up questions asked per interview
     """
     
-    def __init__(self, client):
-        self.client = client
+    def __init__(self, client, router=None, sharded_evaluation=False, result_writer=None,
+                 adaptive=False, max_follow_ups=2):
         self.voice = VoiceInterface()
+        self.engine = InterviewEngine(client, router, sharded_evaluation=sharded_evaluation,
+                                      stt=self._listen, tts=self._speak)
+        self.result_writer = result_writer
+        self.adaptive = adaptive
+        self.max_follow_ups = max_follow_ups
+
+    async def _listen(self, source=None, on_partial=None):
+        return await asyncio.to_thread(self.voice.listen, on_partial)
 
-    def generate_questions(self, job_role: str) -> List[str]:
+    async def _speak(self, text):
+        await asyncio.to_thread(self.voice.speak, text)
+
+    async def interview(self, job_role: str) -> Dict:
         """
-        Generate interview questions based on the job role.
+        Ask the questions out loud, collect spoken answers and evaluate them.
         
         Args:
             job_role (str): The position being interviewed for
             
         Returns:
-            List[str]: List of 5 interview questions
-            
-        Raises:
-            Exception: If question generation fails
+            Dict: Result with job_role, timestamp, interview_responses and evaluation
         """
-        prompt = f"""
-        Generate 5 unique interview questions for a {job_role} position.
-        Mix of:
-        - Technical skills for {job_role}
-        - Problem-solving scenarios
-        - System design (if applicable)
-        - Team collaboration
-        - Past experience
+        await self.engine.speak(f"Welcome to the interview for the {job_role} position. I will ask you questions, and you can respond verbally.")
+        await asyncio.sleep(1)
         
-        Make questions specific to {job_role} and avoid generic questions.
-        Please make the questions short and small, I mean do not make it too long
-        Format your response as a JSON array of questions only:
-        ["question1", "question2", "question3", "question4", "question5"]
-        """
+        questions = await self.engine.generate_questions(job_role)
         
-        try:
-            response = self.client.create_completion(
-                model="gemini-2.0-flash-exp",
-                messages=[{
-                    "role": "user", 
-                    "content": prompt + f"\nTimestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}"
-                }]
-            )
-            
-            raw_response = response.choices[0].message.content
-            
-            # Clean up the response to extract just the JSON array
-            # Remove any markdown formatting or extra text
-            json_str = raw_response.strip()
-            if '```' in json_str:
-                json_str = json_str.split('```')[1].strip()
-                if json_str.startswith('json'):
-                    json_str = json_str[4:].strip()
-            
-            # Parse the JSON array
-            questions = json.loads(json_str)
-            
-            # Ensure we have exactly 5 questions
-            if len(questions) > 5:
-                questions = questions[:5]
-            elif len(questions) < 5:
-                raise ValueError("Not enough questions generated")
-                
-            return questions
-            
-        except Exception as e:
-            print(f"Error generating questions: {str(e)}")
-            # Generate dynamic questions instead of using fallback
-            return self.generate_dynamic_questions(job_role)
-    
-    def generate_dynamic_questions(self, job_role: str) -> List[str]:
-        """
-        Fallback method to generate questions if primary method fails.
+        async def ask(index, question):
+            print(f"\nQuestion {index + 1}: {question}")
+            await self.engine.speak(question)
         
-        Args:
-            job_role (str): The position being interviewed for
-            
-        Returns:
-            List[str]: List of 5 interview questions
-            
-        Raises:
-            Exception: If unable to generate questions
-        """
-        # Try a simpler prompt as a backup
-        prompt = f"List 5 interview questions for a {job_role} position. Return only the questions as a JSON array. Please make the questions short and small, I mean do not make it too long"
+        async def answer(on_partial):
+            # Get verbal response
+            response = None
+            while response is None:
+                response = await self.engine.transcribe(on_partial=on_partial)
+                if response is None:
+                    await self.engine.speak("I didn't catch that. Could you please repeat your answer?")
+            # Brief pause between questions
+            await asyncio.sleep(1)
+            return response
         
+        # One microphone stream and one noise calibration for all answers
+        await asyncio.to_thread(self.voice.start_session)
         try:
-            response = self.client.create_completion(
-                model="gemini-2.0-flash-exp",
-                messages=[{
-                    "role": "user", 
-                    "content": prompt
-                }]
+            interview_responses = await self.engine.run_questions(
+                job_role, questions, ask, answer,
+                adaptive=self.adaptive, max_follow_ups=self.max_follow_ups
             )
-            
-            raw_response = response.choices[0].message.content
-            
-            # Try to extract a JSON array from the response
-            questions = json.loads(raw_response)
-            return questions[:5] if len(questions) >= 5 else [
-                f"What makes you a strong candidate for this {job_role} position?",
-                "Tell me about a challenging project you worked on recently.",
-                "How do you approach learning new technologies?",
-                "Describe your experience with team collaboration.",
-                "What are your career goals?"
-            ]
-            
-        except:
-            # If all else fails, raise an error
-            raise Exception("Unable to generate interview questions. Please try again.")
-
-    def evaluate_interview(self, job_role: str, interview_data: List[Dict]) -> Dict:
-        """
-        Evaluate candidate responses and generate comprehensive feedback.
-        
-        Args:
-            job_role (str): The position being interviewed for
-            interview_data (List[Dict]): List of question-response pairs
-            
-        Returns:
-            Dict: Structured evaluation including scores and feedback
-        """
-        # Construct a comprehensive evaluation prompt
-        prompt = f"""
-        As an expert hiring manager, evaluate this candidate for a {job_role} position.
+        finally:
+            await asyncio.to_thread(self.voice.end_session)
         
-        Here are their interview responses:
-        
-        {'-' * 40}
-        """ + "\n".join([
-            f"Q{i+1}: {response['question']}\n"
-            f"A: {response['response']}\n"
-            for i, response in enumerate(interview_data)
-        ]) + f"""
-        {'-' * 40}
-
-        Provide a structured evaluation in this exact JSON format:
-        {{
-            "overall_score": <number between 1-10>,
-            "technical_competency": <number between 1-10>,
-            "problem_solving": <number between 1-10>,
-            "communication": <number between 1-10>,
-            "experience_level": <number between 1-10>,
-            "cultural_fit": <number between 1-10>,
-            "strengths": ["strength1", "strength2"],
-            "areas_for_improvement": ["area1", "area2"],
-            "hiring_recommendation": "<strong yes/yes/maybe/no>",
-            "detailed_feedback": "<your comprehensive evaluation>"
-        }}
-
-        Ensure your response is valid JSON and includes all fields.
-        """
-
-        try:
-            response = self.client.create_completion(
-                model="gemini-2.0-flash-exp",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            raw_response = response.choices[0].message.content
-            
-            # Try to extract JSON from the response
-            try:
-                # First, try direct JSON parsing
-                evaluation = json.loads(raw_response)
-            except json.JSONDecodeError:
-                # If that fails, try to extract JSON from markdown or text
-                try:
-                    # Look for JSON between triple backticks
-                    json_match = re.search(r'```json\s*(.*?)\s*```', raw_response, re.DOTALL)
-                    if json_match:
-                        evaluation = json.loads(json_match.group(1))
-                    else:
-                        # Try to find JSON-like content between curly braces
-                        json_match = re.search(r'\{.*\}', raw_response, re.DOTALL)
-                        if json_match:
-                            evaluation = json.loads(json_match.group(0))
-                        else:
-                            raise ValueError("No JSON found in response")
-                except:
-                    print("\nDebug - Raw response from API:")
-                    print(raw_response)
-                    raise
-            
-            # Validate required fields
-            required_fields = [
-                "overall_score", "technical_competency", "problem_solving",
-                "communication", "experience_level", "cultural_fit",
-                "strengths", "areas_for_improvement", "hiring_recommendation",
-                "detailed_feedback"
-            ]
-            
-            for field in required_fields:
-                if field not in evaluation:
-                    evaluation[field] = "Not provided" if field != "overall_score" else 5
-            
-            return evaluation
-            
-        except Exception as e:
-            print(f"\nDebug - Error occurred: {str(e)}")
-            # Return a structured fallback response
-            return {
-                "overall_score": 5,
-                "technical_competency": 5,
-                "problem_solving": 5,
-                "communication": 5,
-                "experience_level": 5,
-                "cultural_fit": 5,
-                "strengths": ["Unable to determine strengths"],
-                "areas_for_improvement": ["Unable to determine areas for improvement"],
-                "hiring_recommendation": "maybe",
-                "detailed_feedback": f"Error processing evaluation: {str(e)}"
-            }
+        await self.engine.speak("The interview is now complete. Thank you for your time.")
+        print("\nAnalyzing responses...")
+        evaluation = await self.engine.evaluate_interview(job_role, interview_responses)
+        return {
+            "job_role": job_role,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "interview_responses": interview_responses,
+            "evaluation": evaluation
+        }
 
     def run_interview(self, job_role: str):
         """
@@ -341,41 +220,10 @@ class InterviewAI:
             - Saves results to a JSON file
         """
         print(f"\nStarting interview for {job_role} position...")
-        self.voice.speak(f"Welcome to the interview for the {job_role} position. I will ask you questions, and you can respond verbally.")
-        time.sleep(1)
         
         try:
-            questions = self.generate_questions(job_role)
-            if not questions:
-                raise Exception("Failed to generate questions")
-                
-            interview_responses = []
-            
-            for i, question in enumerate(questions, 1):
-                print(f"\nQuestion {i}: {question}")
-                self.voice.speak(question)
-                
-                # Get verbal response
-                response = None
-                while response is None:
-                    response = self.voice.listen()
-                    if response is None:
-                        self.voice.speak("I didn't catch that. Could you please repeat your answer?")
-                
-                interview_responses.append({
-                    "question": question,
-                    "response": response
-                })
-                
-                # Brief pause between questions
-                time.sleep(1)
-            
-         
-      
-            self.voice.speak("The interview is now complete. Thank you for your time.")
-            print("\nAnalyzing responses...")
-            
-            evaluation = self.evaluate_interview(job_role, interview_responses)
+            results = asyncio.run(self.interview(job_role))
+            evaluation = results["evaluation"]
             
             # Display and speak results
             print("\nInterview Evaluation:")
@@ -402,18 +250,12 @@ class InterviewAI:
                 print(f"\nHiring Recommendation: {evaluation['hiring_recommendation']}")
             
             # Save results
-            results = {
-                "job_role": job_role,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "interview_responses": interview_responses,
-                "evaluation": evaluation
-            }
-            
-            filename = f"Result/interview_results_{time.strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, "w") as f:
-                json.dump(results, f, indent=2)
+            if self.result_writer is None:
+                self.result_writer = ResultWriter("Result")
+            filename = self.result_writer.save(results)
+            ScoreIndex.record("Result", os.path.basename(filename), job_role, evaluation)
             
-            print(f"\nResults saved to {filename}")
+            print(f"\nResults queued for {filename}")
         
                 
         except Exception as e:
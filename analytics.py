@@ -0,0 +1,253 @@
+"""
+Analytics over historical interview evaluations.
+This module loads every result in Result/ into compact NumPy columns in a single pass,
+computes per-role score distributions, dimension correlations and recommendation rates,
+and exports the columns to a columnar file (.npz, or Parquet when pyarrow is installed).
+"""
+
+import argparse
+import glob
+import json
+import os
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SCORE_FIELDS = [
+    "overall_score", "technical_competency", "problem_solving",
+    "communication", "experience_level", "cultural_fit",
+]
+
+# Scores are stored as int8; anything missing or unparseable becomes MISSING.
+MISSING = -1
+
+
+def parse_score(value) -> int:
+    try:
+        score = int(round(float(value)))
+    except (TypeError, ValueError):
+        return MISSING
+    return score if 0 <= score <= 10 else MISSING
+
+
+def normalize_label(label) -> str:
+    return " ".join(str(label or "").lower().split())
+
+
+class EvaluationTable:
+    """
+    Column store of historical evaluations.
+
+    Attributes:
+        scores (np.ndarray): int8 array of shape (n, len(SCORE_FIELDS)), MISSING where absent
+        role_codes (np.ndarray): int32 codes into ``roles``
+        roles (List[str]): Dictionary of normalized job roles
+        recommendation_codes (np.ndarray): int16 codes into ``recommendations``, MISSING
+            where the evaluation has no recommendation
+        recommendations (List[str]): Dictionary of normalized hiring recommendations, in
+            the order they first appear (e.g. "strong no" as well as "yes" or "maybe")
+        sources (List[str]): Result file each row was loaded from
+    """
+
+    def __init__(self, scores, role_codes, roles, recommendation_codes, recommendations, sources):
+        self.scores = scores
+        self.role_codes = role_codes
+        self.roles = roles
+        self.recommendation_codes = recommendation_codes
+        self.recommendations = recommendations
+        self.sources = sources
+
+    def __len__(self):
+        return len(self.role_codes)
+
+    @classmethod
+    def load(cls, result_dir: str = "Result") -> "EvaluationTable":
+        """
+        Build the table from every interview_results_*.json file in one pass.
+
+        Args:
+            result_dir (str): Directory holding the result files
+
+        Returns:
+            EvaluationTable: The loaded columns
+        """
+        scores = array("b")
+        role_codes = array("i")
+        recommendation_codes = array("h")
+        role_index: Dict[str, int] = {}
+        recommendation_index: Dict[str, int] = {}
+        sources = []
+
+        for path in sorted(glob.glob(os.path.join(result_dir, "interview_results_*.json"))):
+            try:
+                with open(path, "r") as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                continue
+            evaluation = result.get("evaluation") or {}
+            role = normalize_label(result.get("job_role"))
+            role_codes.append(role_index.setdefault(role, len(role_index)))
+            scores.extend(parse_score(evaluation.get(field)) for field in SCORE_FIELDS)
+            recommendation = normalize_label(evaluation.get("hiring_recommendation"))
+            recommendation_codes.append(
+                recommendation_index.setdefault(recommendation, len(recommendation_index))
+                if recommendation else MISSING)
+            sources.append(path)
+
+        return cls(
+            scores=np.frombuffer(scores, dtype=np.int8).reshape(-1, len(SCORE_FIELDS)).copy(),
+            role_codes=np.frombuffer(role_codes, dtype=np.int32).copy(),
+            roles=list(role_index),
+            recommendation_codes=np.frombuffer(recommendation_codes, dtype=np.int16).copy(),
+            recommendations=list(recommendation_index),
+            sources=sources,
+        )
+
+    def role_distributions(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Per-role, per-dimension count, mean, standard deviation, quartiles and histogram.
+
+        Returns:
+            Dict: role -> dimension -> statistics
+        """
+        report = {}
+        n_roles = len(self.roles)
+        for column, field in enumerate(SCORE_FIELDS):
+            values = self.scores[:, column]
+            valid = values != MISSING
+            codes = self.role_codes[valid]
+            vals = values[valid].astype(np.int64)
+            # Histogram of every role at once: one bincount over (role, score) pairs
+            hist = np.bincount(codes * 11 + vals, minlength=n_roles * 11).reshape(n_roles, 11)
+            counts = hist.sum(axis=1)
+            sums = np.bincount(codes, weights=vals, minlength=n_roles)
+            sq_sums = np.bincount(codes, weights=vals * vals, minlength=n_roles)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = sums / counts
+                stds = np.sqrt(np.maximum(sq_sums / counts - means * means, 0.0))
+            cumulative = np.cumsum(hist, axis=1)
+            for code, role in enumerate(self.roles):
+                if not counts[code]:
+                    continue
+                quartiles = [
+                    int(np.searchsorted(cumulative[code], q * counts[code], side="left"))
+                    for q in (0.25, 0.5, 0.75)
+                ]
+                report.setdefault(role, {})[field] = {
+                    "count": int(counts[code]),
+                    "mean": round(float(means[code]), 2),
+                    "std": round(float(stds[code]), 2),
+                    "p25": quartiles[0],
+                    "median": quartiles[1],
+                    "p75": quartiles[2],
+                    "histogram": hist[code].tolist(),
+                }
+        return report
+
+    def correlations(self) -> Dict[str, Dict[str, float]]:
+        """
+        Pearson correlation between score dimensions over rows where all are present.
+        """
+        complete = self.scores[(self.scores != MISSING).all(axis=1)].astype(np.float64)
+        if len(complete) < 2:
+            return {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = np.corrcoef(complete, rowvar=False)
+        return {
+            a: {b: (None if np.isnan(matrix[i, j]) else round(float(matrix[i, j]), 3))
+                for j, b in enumerate(SCORE_FIELDS)}
+            for i, a in enumerate(SCORE_FIELDS)
+        }
+
+    def recommendation_rates(self) -> Dict[str, Dict[str, float]]:
+        """
+        Share of each hiring recommendation per role (evaluations without one are excluded).
+        """
+        valid = self.recommendation_codes != MISSING
+        n_roles, n_labels = len(self.roles), len(self.recommendations)
+        table = np.bincount(
+            self.role_codes[valid].astype(np.int64) * n_labels + self.recommendation_codes[valid],
+            minlength=n_roles * n_labels,
+        ).reshape(n_roles, n_labels)
+        totals = table.sum(axis=1)
+        return {
+            role: {label: round(float(table[code, i] / totals[code]), 3)
+                   for i, label in enumerate(self.recommendations)}
+            for code, role in enumerate(self.roles) if totals[code]
+        }
+
+    def report(self) -> Dict:
+        return {
+            "interviews": len(self),
+            "roles": len(self.roles),
+            "distributions": self.role_distributions(),
+            "correlations": self.correlations(),
+            "recommendation_rates": self.recommendation_rates(),
+            "missing_recommendations": int((self.recommendation_codes == MISSING).sum()),
+        }
+
+    def export(self, path: str):
+        """
+        Write the columns to ``path``. A .parquet suffix writes Parquet (requires pyarrow);
+        anything else writes a compressed NumPy .npz archive.
+        """
+        if path.endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+            # Missing scores are written as nulls, not the MISSING sentinel
+            columns = {field: pa.array(self.scores[:, i], mask=self.scores[:, i] == MISSING)
+                       for i, field in enumerate(SCORE_FIELDS)}
+            columns["job_role"] = pa.DictionaryArray.from_arrays(
+                pa.array(self.role_codes), pa.array(self.roles, type=pa.string()))
+            columns["hiring_recommendation"] = pa.DictionaryArray.from_arrays(
+                pa.array(self.recommendation_codes, mask=self.recommendation_codes == MISSING),
+                pa.array(self.recommendations, type=pa.string()))
+            pq.write_table(pa.table(columns), path)
+            return
+        np.savez_compressed(
+            path,
+            scores=self.scores,
+            score_fields=np.array(SCORE_FIELDS),
+            role_codes=self.role_codes,
+            roles=np.array(self.roles, dtype=str),
+            recommendation_codes=self.recommendation_codes,
+            recommendations=np.array(self.recommendations, dtype=str),
+        )
+
+    @classmethod
+    def from_npz(cls, path: str) -> "EvaluationTable":
+        """Reload a table written by ``export`` to .npz without touching Result/."""
+        with np.load(path) as data:
+            return cls(
+                scores=data["scores"],
+                role_codes=data["role_codes"],
+                roles=data["roles"].tolist(),
+                recommendation_codes=data["recommendation_codes"],
+                recommendations=data["recommendations"].tolist(),
+                sources=[],
+            )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Aggregate historical interview evaluations.")
+    parser.add_argument("--result-dir", default="Result", help="Directory of interview result JSON files")
+    parser.add_argument("--from-npz", help="Load a previously exported .npz instead of scanning result files")
+    parser.add_argument("--export", help="Write the columns to this .npz or .parquet file")
+    args = parser.parse_args(argv)
+
+    if args.from_npz:
+        table = EvaluationTable.from_npz(args.from_npz)
+    else:
+        table = EvaluationTable.load(args.result_dir)
+    print(json.dumps(table.report(), indent=2))
+    if args.export:
+        table.export(args.export)
+        print(f"\nColumns exported to {args.export}")
+
+
+if __name__ == "__main__":
+    main()
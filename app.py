@@ -2,12 +2,18 @@
 Flask backend for real-time, browser-based AI audio interview system.
 """
 
+import asyncio
+import io
 import json
 import os
-import uuid
 import tempfile
-from flask import Flask, request, jsonify, send_from_directory
+import wave
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+try:
+    from flask_sock import Sock
+except ImportError:  # WebSocket mode is optional; the JSON endpoints still work
+    Sock = None
 from gtts import gTTS
 import speech_recognition as sr
 import subprocess
@@ -15,19 +21,54 @@ import glob
 
 # Import your AI logic (modularize if needed)
 from ai_logic import InterviewAI, OpenAIClient  # Ensure these are importable
+from idempotency import RequestDeduplicator, answer_digest, submission_key
+from model_router import ModelRouter
+from result_store import ResultWriter
+from score_index import ScoreIndex
+from session_store import InterviewSession, SessionLimitError, SessionStore
+from segmented_stt import PcmSegmenter, SegmentTranscriber, transcribe_file
+from streaming_tts import stream_speech
 
 app = Flask(__name__, static_folder='static')
 CORS(app)
+sock = Sock(app) if Sock is not None else None
 
-sessions = {}
+# Repeated submissions of the same answer get the first response instead of new STT/LLM work
+submissions = RequestDeduplicator()
+
+# Stream question audio sentence by sentence instead of saving the whole MP3 first
+STREAMING_TTS = True
+# Evaluate with concurrent per-dimension prompts instead of one long generation
+SHARDED_EVALUATION = True
+# Compact schema-constrained JSON with per-stage output caps
+STRUCTURED_OUTPUT = True
+# Adaptive mode: ask a follow-up after a thin answer, drafted from the partial transcript while
+# the candidate talks. Off by default like the voice interviewer's adaptive=False; each
+# follow-up adds a question and an LLM call
+ADAPTIVE_FOLLOW_UPS = False
+MAX_FOLLOW_UPS = 2
+# Abandoned interviews are evicted after SESSION_TTL idle seconds; new ones are refused past MAX_SESSIONS
+SESSION_TTL = 30 * 60
+MAX_SESSIONS = 1000
+# Answers larger than this are refused (about 10 minutes of 16 kHz 16-bit PCM)
+MAX_ANSWER_BYTES = 20 * 1024 * 1024
+# Uploads are copied to disk and hashed this many bytes at a time
+UPLOAD_CHUNK = 64 * 1024
+
+sessions = SessionStore(ttl=SESSION_TTL, max_sessions=MAX_SESSIONS)
 
 # Set up your OpenAI/Gemini client
 api_key = "YOUR_API_KEY"
 base_url = "YOUR_BASE_URL"
 client = OpenAIClient(api_key, base_url)
+# Shared so latency/error stats persist across requests
+router = ModelRouter.from_env()
 
 RESULT_DIR = os.path.join(os.path.dirname(__file__), 'Result')
 AUDIO_SCRIPT = os.path.join(os.path.dirname(__file__), 'Audio_AI_interview.py')
+score_index = ScoreIndex(RESULT_DIR)
+# Results are written in the background; pending writes are flushed at exit
+result_writer = ResultWriter(RESULT_DIR)
 
 @app.route('/')
 def serve_index():
@@ -37,6 +78,134 @@ def serve_index():
 def serve_static(filename):
     return send_from_directory(app.static_folder, filename)
 
+def create_session(job_role):
+    # Refuse before spending an LLM call when the server is already full
+    sessions.ensure_capacity()
+    questions = interview_ai.generate_questions(job_role)
+    return sessions.add(InterviewSession(job_role, questions))
+
+def synthesize_question(session_id, index):
+    """Save the question's TTS under static/ and return its URL."""
+    audio_filename = f"{session_id}_q{index}.mp3"
+    tts = gTTS(text=sessions.get(session_id).questions[index], lang='en')
+    tts.save(os.path.join('static', audio_filename))
+    return f'/static/{audio_filename}'
+
+def question_audio_url(session_id, index):
+    if STREAMING_TTS:
+        return f'/question_audio/{session_id}/{index}'
+    return synthesize_question(session_id, index)
+
+@app.route('/question_audio/<session_id>/<int:index>')
+def stream_question_audio(session_id, index):
+    """Chunked MP3 of a question, written out as each sentence is synthesized."""
+    session = sessions.get(session_id)
+    if not session or not 0 <= index < len(session.questions):
+        return jsonify({'error': 'Invalid session.'}), 404
+    return Response(stream_with_context(stream_speech(session.questions[index])), mimetype='audio/mpeg')
+
+async def transcribe_audio_file(path, on_partial=None):
+    # Split at pauses and transcribe the chunks in parallel instead of one long request.
+    # Silence transcribes as ""; an unreachable STT service raises sr.RequestError
+    return await asyncio.to_thread(transcribe_file, path, on_partial=on_partial)
+
+STT_UNAVAILABLE = 'Speech recognition is unavailable right now. Please answer again.'
+
+# One engine for every session; its LLM and STT calls run on a shared event loop
+interview_ai = InterviewAI(client, router, sharded_evaluation=SHARDED_EVALUATION,
+                           structured_output=STRUCTURED_OUTPUT, stt=transcribe_audio_file)
+
+def pcm_to_wav(pcm, sample_rate):
+    # The browser recorder streams raw 16-bit mono PCM; give it a WAV header for the STT reader
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+def write_temp_audio(data):
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
+        temp_audio.write(data)
+    return temp_audio.name
+
+def save_upload(stream):
+    """
+    Copy an uploaded answer to a temp file, hashing it on the way, so the recording is
+    never held in memory. Returns (path, sha256 hex digest), or (None, None) if the
+    answer is larger than MAX_ANSWER_BYTES.
+    """
+    digest = answer_digest()
+    size = 0
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
+        while size <= MAX_ANSWER_BYTES:
+            chunk = stream.read(UPLOAD_CHUNK)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+            temp_audio.write(chunk)
+    if size > MAX_ANSWER_BYTES:
+        os.remove(temp_audio.name)
+        return None, None
+    return temp_audio.name, digest.hexdigest()
+
+def follow_up_speculation(session):
+    # Follow-ups are never followed up, and each interview gets at most MAX_FOLLOW_UPS
+    if not ADAPTIVE_FOLLOW_UPS:
+        return None
+    index = session.current_index
+    if index in session.follow_ups or len(session.follow_ups) >= MAX_FOLLOW_UPS:
+        return None
+    return interview_ai.speculate_follow_up(session.job_role, session.questions[index])
+
+def record_answer(session, question_index, response_text, speculation=None):
+    """
+    Store an answer and advance the session.
+
+    A thin answer gets a follow-up question inserted right after it; ``speculation`` is the
+    follow-up drafted while the answer was being streamed, if any.
+
+    Returns the next question ({'question_index', 'question_text'}) or, after the last
+    answer, the saved result ({'result', 'percentiles'}).
+    """
+    question = session.questions[question_index]
+    session.answers.append({
+        'question': question,
+        'response': response_text
+    })
+    if speculation is None or speculation.question != question:
+        speculation = follow_up_speculation(session)
+    follow_up = speculation.resolve(response_text) if speculation else None
+    if follow_up:
+        session.questions.insert(question_index + 1, follow_up)
+        session.follow_ups.append(question_index + 1)
+    session.current_index += 1
+
+    # Next question or finish
+    if session.current_index < len(session.questions):
+        next_index = session.current_index
+        return {
+            'question_index': next_index,
+            'question_text': session.questions[next_index]
+        }
+
+    # Evaluate and return results
+    evaluation = interview_ai.evaluate_interview(session.job_role, session.answers)
+    result = {
+        'job_role': session.job_role,
+        'questions': session.questions,
+        'answers': session.answers,
+        'evaluation': evaluation
+    }
+    # Rank against the role's history before this result joins it
+    percentiles = score_index.percentiles(session.job_role, evaluation)
+    filename = result_writer.save(result, result_id=session.session_id)
+    score_index.add(os.path.basename(filename), session.job_role, evaluation)
+    sessions.remove(session.session_id)
+    return {'result': result, 'percentiles': percentiles}
+
 @app.route('/start_interview', methods=['POST'])
 def start_interview():
     data = request.get_json()
@@ -44,88 +213,243 @@ def start_interview():
     if not job_role:
         return jsonify({'error': 'Job role is required.'}), 400
 
-    interview_ai = InterviewAI(client)
-    questions = interview_ai.generate_questions(job_role)
-    session_id = str(uuid.uuid4())
-    sessions[session_id] = {
-        'job_role': job_role,
-        'questions': questions,
-        'answers': [],
-        'current_index': 0
-    }
-
-    # Generate TTS for first question
-    question_text = questions[0]
-    audio_filename = f"{session_id}_q0.mp3"
-    tts = gTTS(text=question_text, lang='en')
-    tts.save(os.path.join('static', audio_filename))
-
+    try:
+        session = create_session(job_role)
+    except SessionLimitError:
+        return jsonify({'error': 'Too many interviews in progress. Please try again later.'}), 503
     return jsonify({
-        'session_id': session_id,
+        'session_id': session.session_id,
         'question_index': 0,
-        'question_text': question_text,
-        'question_audio_url': f'/static/{audio_filename}'
+        'question_text': session.questions[0],
+        'question_audio_url': question_audio_url(session.session_id, 0)
     })
 
+def process_answer(session_id, question_index, digest, audio_path=None, transcript=None, speculation=None):
+    """
+    Transcribe and record an answer exactly once per (session, question, audio content).
+
+    ``digest`` is the SHA-256 of the answer audio and ``audio_path`` the file it was saved
+    to; ``transcript`` skips transcription when the answer was already transcribed while
+    it was streamed. Returns (payload, status). A retry of the same answer gets the original
+    payload, even after the last answer has been evaluated and the session removed.
+    """
+    def work():
+        session = sessions.get(session_id)
+        if session is None:
+            return {'error': 'Invalid session.'}, 400
+        with session.lock:
+            if question_index != session.current_index:
+                return {
+                    'error': 'Answer does not match the current question.',
+                    'question_index': session.current_index
+                }, 409
+
+            response_text = transcript
+            follow_up = speculation
+            if response_text is None:
+                # Draft the follow-up from the leading segments while the rest is transcribed
+                follow_up = follow_up_speculation(session)
+                try:
+                    response_text = interview_ai.transcribe(audio_path,
+                                                            on_partial=follow_up.update if follow_up else None)
+                except sr.RequestError:
+                    # Not cached and the session stays on this question, so a retry transcribes again
+                    return {'error': STT_UNAVAILABLE}, 503
+                except ValueError:
+                    return {'error': 'Could not read the answer audio.'}, 400
+
+            payload = record_answer(session, question_index, response_text, follow_up)
+        if 'question_index' in payload:
+            payload['question_audio_url'] = question_audio_url(session_id, payload['question_index'])
+        payload['transcript'] = response_text
+        return payload, 200
+
+    return submissions.run(submission_key(session_id, question_index, digest), work)
+
 @app.route('/submit_answer', methods=['POST'])
 def submit_answer():
     session_id = request.form.get('session_id')
     question_index = int(request.form.get('question_index', 0))
     audio_file = request.files.get('audio')
 
-    if not session_id or session_id not in sessions:
+    if not session_id:
         return jsonify({'error': 'Invalid session.'}), 400
     if not audio_file:
         return jsonify({'error': 'No audio file provided.'}), 400
 
-    # Save audio temporarily and transcribe
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-        audio_file.save(temp_audio.name)
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(temp_audio.name) as source:
-            audio = recognizer.record(source)
-            try:
-                response_text = recognizer.recognize_google(audio)
-            except Exception as e:
-                response_text = ""
-        os.remove(temp_audio.name)
+    audio_path, digest = save_upload(audio_file.stream)
+    if audio_path is None:
+        return jsonify({'error': 'Answer is too long.'}), 413
+    try:
+        payload, status = process_answer(session_id, question_index, digest, audio_path)
+    finally:
+        os.remove(audio_path)
+    return jsonify(payload), status
 
-    # Store answer
-    session = sessions[session_id]
-    session['answers'].append({
-        'question': session['questions'][question_index],
-        'response': response_text
+if sock is not None:
+    @sock.route('/ws/interview')
+    def interview_socket(ws):
+        """
+        Full-duplex interview over one WebSocket.
+
+        Client -> server: {"type": "start", "job_role"}, {"type": "answer_start"} (with
+        "format": "pcm_s16le" and "sample_rate" when the browser sends raw PCM), binary
+        answer audio chunks (at most MAX_ANSWER_BYTES per answer), {"type": "answer_end",
+        "question_index"}.
+        Server -> client: {"type": "question", ...} followed by one binary MP3 frame per
+        sentence and {"type": "question_audio_end"}, {"type": "transcript"},
+        {"type": "result"} and {"type": "error"}.
+        """
+        session_id = None
+        # Raw bytes are kept only when no segmenter consumes them; the hash always runs
+        answer_audio = bytearray()
+        answer_hash = answer_digest()
+        answer_size = 0
+        answer_format = None
+        sample_rate = 16000
+        # Raw PCM answers are segmented and transcribed while they stream in
+        transcriber = segmenter = speculation = None
+
+        def discard_transcription():
+            # An abandoned answer's segments must not keep the worker pool and STT calls busy
+            if transcriber is not None:
+                transcriber.close()
+
+        def push_question(index, question_text):
+            ws.send(json.dumps({
+                'type': 'question',
+                'session_id': session_id,
+                'question_index': index,
+                'question_text': question_text
+            }))
+            for audio in stream_speech(question_text):
+                ws.send(audio)
+            ws.send(json.dumps({'type': 'question_audio_end', 'question_index': index}))
+
+        try:
+            while True:
+                message = ws.receive()
+                if message is None:
+                    break
+                if isinstance(message, bytes):
+                    answer_size += len(message)
+                    if answer_size > MAX_ANSWER_BYTES:
+                        # Refused at answer_end; stop transcribing it right away
+                        answer_audio = bytearray()
+                        discard_transcription()
+                        transcriber = segmenter = None
+                        continue
+                    answer_hash.update(message)
+                    if segmenter is not None:
+                        segmenter.feed(message)
+                    else:
+                        answer_audio.extend(message)
+                    continue
+
+                data = json.loads(message)
+                if data.get('type') == 'start':
+                    job_role = data.get('job_role')
+                    if not job_role:
+                        ws.send(json.dumps({'type': 'error', 'error': 'Job role is required.'}))
+                        continue
+                    try:
+                        session = create_session(job_role)
+                    except SessionLimitError:
+                        ws.send(json.dumps({'type': 'error',
+                                            'error': 'Too many interviews in progress. Please try again later.'}))
+                        continue
+                    session_id = session.session_id
+                    push_question(0, session.questions[0])
+                elif data.get('type') == 'answer_start':
+                    answer_audio = bytearray()
+                    answer_hash = answer_digest()
+                    answer_size = 0
+                    answer_format = data.get('format')
+                    sample_rate = int(data.get('sample_rate', 16000))
+                    discard_transcription()
+                    transcriber = segmenter = speculation = None
+                    session = sessions.get(session_id) if session_id else None
+                    if answer_format == 'pcm_s16le' and session is not None:
+                        speculation = follow_up_speculation(session)
+                        transcriber = SegmentTranscriber(sr.Recognizer(),
+                                                         on_partial=speculation.update if speculation else None)
+                        segmenter = PcmSegmenter(transcriber, sample_rate, 2, transcriber.recognizer.energy_threshold)
+                elif data.get('type') == 'answer_end':
+                    if not session_id:
+                        ws.send(json.dumps({'type': 'error', 'error': 'Invalid session.'}))
+                        continue
+                    if answer_size > MAX_ANSWER_BYTES:
+                        answer_audio = bytearray()
+                        discard_transcription()
+                        transcriber = segmenter = speculation = None
+                        ws.send(json.dumps({'type': 'error', 'error': 'Answer is too long.'}))
+                        continue
+                    transcript = audio_path = None
+                    if segmenter is not None:
+                        segmenter.flush()
+                        try:
+                            transcript = transcriber.result()
+                        except sr.UnknownValueError:
+                            transcript = ""
+                        except sr.RequestError:
+                            transcriber = segmenter = speculation = None
+                            ws.send(json.dumps({'type': 'error', 'error': STT_UNAVAILABLE}))
+                            continue
+                    elif answer_format == 'pcm_s16le':
+                        audio_path = write_temp_audio(pcm_to_wav(bytes(answer_audio), sample_rate))
+                    else:
+                        audio_path = write_temp_audio(bytes(answer_audio))
+                    answer_audio = bytearray()
+                    try:
+                        payload, status = process_answer(session_id, int(data.get('question_index', 0)),
+                                                         answer_hash.hexdigest(), audio_path,
+                                                         transcript=transcript, speculation=speculation)
+                    finally:
+                        if audio_path is not None:
+                            os.remove(audio_path)
+                    transcriber = segmenter = speculation = None
+                    if status != 200:
+                        ws.send(json.dumps({'type': 'error', **payload}))
+                        continue
+                    ws.send(json.dumps({'type': 'transcript', 'text': payload['transcript']}))
+                    if 'result' in payload:
+                        ws.send(json.dumps({'type': 'result', **payload}))
+                        break
+                    push_question(payload['question_index'], payload['question_text'])
+        finally:
+            discard_transcription()
+
+@app.route('/session_stats', methods=['GET'])
+def session_stats():
+    return jsonify(sessions.stats())
+
+@app.route('/percentile', methods=['GET'])
+def percentile():
+    job_role = request.args.get('job_role')
+    dimension = request.args.get('dimension', 'overall_score')
+    score = request.args.get('score')
+    if not job_role or score is None:
+        return jsonify({'error': 'job_role and score are required.'}), 400
+    return jsonify({
+        'job_role': job_role,
+        'dimension': dimension,
+        'score': score,
+        'percentile': score_index.percentile(job_role, dimension, score),
+        'history_size': score_index.count(job_role, dimension)
     })
-    session['current_index'] += 1
 
-    # Next question or finish
-    if session['current_index'] < len(session['questions']):
-        next_index = session['current_index']
-        question_text = session['questions'][next_index]
-        audio_filename = f"{session_id}_q{next_index}.mp3"
-        tts = gTTS(text=question_text, lang='en')
-        tts.save(os.path.join('static', audio_filename))
-        return jsonify({
-            'question_index': next_index,
-            'question_text': question_text,
-            'question_audio_url': f'/static/{audio_filename}',
-            'transcript': response_text
-        })
-    else:
-        # Evaluate and return results
-        interview_ai = InterviewAI(client)
-        evaluation = interview_ai.evaluate_interview(session['job_role'], session['answers'])
-        result = {
-            'job_role': session['job_role'],
-            'questions': session['questions'],
-            'answers': session['answers'],
-            'evaluation': evaluation
-        }
-        filename = f"Result/interview_results_{session_id}.json"
-        with open(filename, "w") as f:
-            json.dump(result, f, indent=2)
-        del sessions[session_id]
-        return jsonify({'result': result, 'transcript': response_text})
+@app.route('/top_candidates', methods=['GET'])
+def top_candidates():
+    job_role = request.args.get('job_role')
+    dimension = request.args.get('dimension', 'overall_score')
+    k = request.args.get('k', 10, type=int)
+    if not job_role:
+        return jsonify({'error': 'job_role is required.'}), 400
+    return jsonify({'job_role': job_role, 'dimension': dimension, 'top': score_index.top(job_role, dimension, k)})
+
+@app.route('/model_stats', methods=['GET'])
+def model_stats():
+    return jsonify({'routes': router.routes, 'stages': router.stats()})
 
 @app.route('/run_interview', methods=['POST'])
 def run_interview():
@@ -141,10 +465,10 @@ def run_interview():
         return jsonify({'error': 'Interview failed.', 'details': str(e)}), 500
 
     # Find the latest result file
-    result_files = sorted(glob.glob(os.path.join(RESULT_DIR, 'interview_results_*.json')), reverse=True)
+    result_files = glob.glob(os.path.join(RESULT_DIR, 'interview_results_*.json'))
     if not result_files:
         return jsonify({'error': 'No result file found.'}), 500
-    with open(result_files[0], 'r') as f:
+    with open(max(result_files, key=os.path.getmtime), 'r') as f:
         result_data = json.load(f)
     return jsonify(result_data)
 
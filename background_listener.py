@@ -0,0 +1,196 @@
+"""
+Session-scoped background listening for the voice interviewer.
+This module opens the microphone once per interview, calibrates for ambient noise once,
+and keeps capturing phrases on a background thread so each answer starts without device
+setup or a calibration delay.
+"""
+
+import audioop
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+import speech_recognition as sr
+
+from segmented_stt import MAX_SEGMENT, SEGMENT_PAUSE, SegmentTranscriber
+
+
+class _Stopped(Exception):
+    """Raised from a stream read once the listener has been stopped."""
+
+
+class _StoppableSource(sr.AudioSource):
+    """
+    The open microphone as seen by ``recognizer.listen``: every chunk read checks that
+    the listener is still running, so a phrase capture (up to MAX_SEGMENT long) ends
+    within one chunk of ``stop``, and every chunk is passed to ``on_chunk`` as it is
+    heard, before the phrase it belongs to is complete.
+    """
+
+    def __init__(self, source: sr.AudioSource, running: threading.Event, on_chunk: Callable[[bytes], None]):
+        self.source = source
+        self.running = running
+        self.on_chunk = on_chunk
+        self.stream = self
+
+    def __getattr__(self, name):
+        return getattr(self.source, name)
+
+    def read(self, size: int) -> bytes:
+        if not self.running.is_set():
+            raise _Stopped()
+        chunk = self.source.stream.read(size)
+        self.on_chunk(chunk)
+        return chunk
+
+
+class BackgroundListener:
+    """
+    Captures phrases from one long-lived microphone stream.
+
+    Phrases are only kept while an answer is being collected; anything heard in between
+    (e.g. the interviewer's own speech) is dropped, so the buffer stays small. The energy
+    threshold keeps adapting to the room through the recognizer's dynamic threshold.
+
+    Attributes:
+        recognizer (sr.Recognizer): Recognizer used for capture and transcription
+        end_pause (float): Seconds of silence that end an answer
+    """
+
+    def __init__(self, recognizer: sr.Recognizer, microphone: Optional[sr.Microphone] = None,
+                 end_pause: float = 2.0, calibration: float = 0.5, workers: int = 4, max_phrases: int = 64):
+        self.recognizer = recognizer
+        self.microphone = microphone or sr.Microphone()
+        self.end_pause = end_pause
+        self.calibration = calibration
+        self.workers = workers
+        self._phrases = queue.Queue(maxsize=max_phrases)
+        self._accepting_since = None
+        # Last time a chunk above the energy threshold was read, i.e. someone was talking
+        self._heard_at = 0.0
+        self._running = threading.Event()
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = None
+
+    def start(self):
+        """Open the stream, calibrate once and start capturing. Blocks until calibrated."""
+        self._running.set()
+        self._thread = threading.Thread(target=self._capture, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        """Stop capturing and close the stream; returns within one audio chunk."""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def listen_answer(self, on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Collect and transcribe one answer from the live stream.
+
+        Phrases are transcribed while the candidate keeps talking; the answer ends after
+        ``end_pause`` seconds in which no speech was heard. Speech is tracked as it is
+        read from the stream, so a long phrase still being captured keeps the answer
+        open even though it is only queued once it ends.
+
+        Args:
+            on_partial (Callable[[str], None]): Called with the transcript so far while
+                the candidate is still talking
+
+        Raises:
+            sr.UnknownValueError: If nothing recognizable was said
+            sr.RequestError: If the recognition service could not be reached
+        """
+        self._drain()
+        self._accepting_since = time.monotonic()
+        transcriber = SegmentTranscriber(self.recognizer, workers=self.workers, on_partial=on_partial)
+        try:
+            # Wait as long as needed for the answer to start
+            transcriber.submit(self._next_phrase(end_pause=None))
+            while True:
+                try:
+                    audio = self._next_phrase(end_pause=self.end_pause)
+                except queue.Empty:
+                    break
+                transcriber.submit(audio)
+        except BaseException:
+            transcriber.close()
+            raise
+        finally:
+            self._accepting_since = None
+        return transcriber.result()
+
+    def _next_phrase(self, end_pause: Optional[float]) -> sr.AudioData:
+        # Raises queue.Empty once nothing is queued and no speech has been heard for
+        # end_pause seconds (a phrase is queued SEGMENT_PAUSE after its last speech)
+        while True:
+            if not self._running.is_set():
+                raise sr.RequestError("Background listener is not running")
+            if end_pause is None:
+                wait = 0.5
+            else:
+                wait = min(0.5, self._heard_at + end_pause - time.monotonic())
+            if wait <= 0:
+                return self._phrases.get_nowait()
+            try:
+                return self._phrases.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def _drain(self):
+        while True:
+            try:
+                self._phrases.get_nowait()
+            except queue.Empty:
+                return
+
+    def _capture(self):
+        recognizer = self.recognizer
+        pause_threshold, non_speaking_duration = recognizer.pause_threshold, recognizer.non_speaking_duration
+        try:
+            with self.microphone as source:
+                recognizer.adjust_for_ambient_noise(source, duration=self.calibration)
+                recognizer.dynamic_energy_threshold = True
+                recognizer.pause_threshold = SEGMENT_PAUSE
+                recognizer.non_speaking_duration = min(non_speaking_duration, SEGMENT_PAUSE)
+                self._ready.set()
+                stoppable = _StoppableSource(source, self._running, self._heard)
+                while self._running.is_set():
+                    try:
+                        audio = recognizer.listen(stoppable, timeout=1, phrase_time_limit=MAX_SEGMENT)
+                    except sr.WaitTimeoutError:
+                        continue
+                    except _Stopped:
+                        break
+                    self._offer(audio)
+        except Exception as e:
+            self._error = e
+            self._running.clear()
+        finally:
+            recognizer.pause_threshold = pause_threshold
+            recognizer.non_speaking_duration = non_speaking_duration
+            self._ready.set()
+
+    def _heard(self, chunk: bytes):
+        if chunk and audioop.rms(chunk, self.microphone.SAMPLE_WIDTH) > self.recognizer.energy_threshold:
+            self._heard_at = time.monotonic()
+
+    def _offer(self, audio: sr.AudioData):
+        accepting_since = self._accepting_since
+        if accepting_since is None:
+            return
+        # Drop a phrase that started before the answer did (e.g. the tail of the question).
+        # Captured phrases carry up to SEGMENT_PAUSE of silence on each side.
+        duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        if time.monotonic() - duration + SEGMENT_PAUSE < accepting_since:
+            return
+        try:
+            self._phrases.put_nowait(audio)
+        except queue.Full:
+            pass
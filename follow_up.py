@@ -0,0 +1,130 @@
+"""
+Adaptive follow-up questions for thin answers.
+This module decides whether an answer needs a follow-up question and generates it
+speculatively from the partial transcript while the candidate is still talking, so asking
+a follow-up costs no extra wait once the answer ends.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+# Answers shorter than this many words get a follow-up question
+THIN_ANSWER_WORDS = 25
+# Reply the model gives when the answer needs no follow-up
+NO_FOLLOW_UP = "NONE"
+
+
+def is_thin(answer: Optional[str], min_words: int = THIN_ANSWER_WORDS) -> bool:
+    return len((answer or "").split()) < min_words
+
+
+def follow_up_prompt(job_role: str, question: str, answer: str) -> str:
+    return f"""
+        You are interviewing a candidate for a {job_role} position.
+        Question: {question}
+        Answer: {answer or "(no answer)"}
+
+        The answer is short. Ask one short follow-up question that gets the candidate to
+        give the missing detail (a concrete example, their own role, the outcome).
+        Reply with the follow-up question only, or {NO_FOLLOW_UP} if the answer is already
+        complete.
+        """
+
+
+def parse_follow_up(raw_response: str) -> Optional[str]:
+    """Return the follow-up question from a model reply, or None if the model declined."""
+    text = (raw_response or "").strip().strip('"')
+    if not text or text.upper().startswith(NO_FOLLOW_UP):
+        return None
+    return text
+
+
+class SpeculativeFollowUp:
+    """
+    Generates a follow-up question from partial transcripts while an answer is in progress.
+
+    Feed every partial transcript to ``update``; while it is still thin, a follow-up is
+    generated for it in the background. At most one generation runs at a time: partials
+    that arrive meanwhile are coalesced and only the newest is generated next. ``resolve``
+    takes the final transcript and reuses the newest speculative follow-up whose partial
+    the final text starts with (streamed transcripts end as "partial + last segment"), so
+    a thin answer never waits for a fresh generation once a draft exists; drafts are
+    thrown away if the final answer is not thin.
+
+    Attributes:
+        submit (Callable[[str], Future]): Starts generating the follow-up for an answer,
+            e.g. InterviewEngine.generate_follow_up scheduled on an event loop
+        question (str): Question being answered
+        min_words (int): Answers with fewer words get a follow-up
+    """
+
+    def __init__(self, submit: Callable[[str], Future], question: str, min_words: int = THIN_ANSWER_WORDS):
+        self.submit = submit
+        self.question = question
+        self.min_words = min_words
+        # Reentrant: a future that is already done runs its callback inside _start_next
+        self._lock = threading.RLock()
+        self._done = threading.Condition(self._lock)
+        self._pending = None    # newest partial not yet generated
+        self._running = None    # partial being generated right now
+        self._results = {}      # partial -> follow-up (or None)
+
+    def update(self, partial: str):
+        """Speculate on a new partial transcript. Safe to call from any thread."""
+        partial = " ".join(partial.split())
+        if not partial or not is_thin(partial, self.min_words):
+            return  # The answer can only get longer: no follow-up will be needed
+        with self._lock:
+            if partial in self._results or partial == self._running:
+                return
+            self._pending = partial
+            if self._running is None:
+                self._start_next()
+
+    def resolve(self, answer: Optional[str], timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Return the follow-up for the final answer, or None if it does not need one.
+
+        Reuses the newest draft the answer extends, waiting for it if it is still in
+        flight, and only generates the follow-up now when there is none. Blocks, so must
+        not run on the event loop that ``submit`` schedules onto.
+        """
+        answer = " ".join((answer or "").split())
+        # Nothing recognized is a transcription problem, not a thin answer
+        if not answer or not is_thin(answer, self.min_words):
+            return None
+        with self._lock:
+            self._pending = None
+            draft = self._draft_for(answer)
+            if draft is not None and draft == self._running:
+                self._done.wait_for(lambda: draft in self._results, timeout=timeout)
+            if draft in self._results:
+                return self._results[draft]
+        try:
+            return self.submit(answer).result(timeout)
+        except Exception as e:
+            print(f"Error generating follow-up question: {e}")
+            return None
+
+    def _draft_for(self, answer: str) -> Optional[str]:
+        # Called with the lock held. The answer is still thin, so a draft for any partial
+        # it extends is still a fair follow-up; the longest such partial is the newest
+        drafts = list(self._results) + ([self._running] if self._running is not None else [])
+        extended = [d for d in drafts if answer == d or answer.startswith(d + " ")]
+        return max(extended, key=len, default=None)
+
+    def _start_next(self):
+        # Called with the lock held
+        partial, self._pending = self._pending, None
+        self._running = partial
+        self.submit(partial).add_done_callback(lambda future: self._finished(partial, future))
+
+    def _finished(self, partial: str, future: Future):
+        follow_up = None if future.cancelled() or future.exception() else future.result()
+        with self._lock:
+            self._results[partial] = follow_up
+            self._running = None
+            self._done.notify_all()
+            if self._pending is not None:
+                self._start_next()
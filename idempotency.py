@@ -0,0 +1,93 @@
+"""
+Request deduplication for answer submissions.
+This module makes repeated submissions of the same answer (network retries, double clicks)
+return the first submission's response instead of running STT and the LLM again.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Tuple
+
+
+def submission_key(session_id: str, question_index: int, digest: str) -> str:
+    """
+    Idempotency key of an answer: session, question and the SHA-256 hex digest of the
+    audio (hashed while it streams in, see answer_digest).
+    """
+    return f"{session_id}:{question_index}:{digest}"
+
+
+def answer_digest():
+    """Running hash for submission_key; feed it the answer's bytes as they arrive."""
+    return hashlib.sha256()
+
+
+class RequestDeduplicator:
+    """
+    Runs each keyed piece of work at most once.
+
+    A repeat of a finished key gets the cached response; a repeat of a key that is still
+    running waits on the same in-flight work. Only successful responses are cached, so a
+    failed attempt can be retried.
+
+    Attributes:
+        ttl (float): Seconds a finished response stays cached
+        max_entries (int): Upper bound on cached responses; oldest are dropped first
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._done = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: str, work: Callable[[], Tuple[dict, int]]) -> Tuple[dict, int]:
+        """
+        Return ``work()``'s (payload, status) for ``key``, running it only once.
+
+        Args:
+            key (str): Idempotency key, see submission_key
+            work (callable): Produces (payload, http_status)
+
+        Returns:
+            Tuple[dict, int]: The response payload and HTTP status
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            if key in self._done:
+                return self._done[key][1]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            response = work()
+        except Exception as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            if response[1] < 400:
+                self._done[key] = (time.monotonic(), response)
+                while len(self._done) > self.max_entries:
+                    self._done.popitem(last=False)
+        future.set_result(response)
+        return response
+
+    def _expire(self, now: float):
+        while self._done:
+            key, (stored_at, _) = next(iter(self._done.items()))
+            if now - stored_at < self.ttl:
+                break
+            del self._done[key]
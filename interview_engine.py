@@ -0,0 +1,400 @@
+"""
+Asynchronous interview engine shared by the text, voice and web interviewers.
+This module holds the one implementation of question generation, follow-ups and evaluation.
+Every model call is a coroutine on an async HTTP client, so an interview waiting on the model,
+speech recognition or speech synthesis holds a suspended coroutine instead of an OS thread.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from follow_up import SpeculativeFollowUp, follow_up_prompt, parse_follow_up
+from model_router import ModelRouter
+from sharded_evaluation import FALLBACK_VALUES, evaluate_sharded, parse_json_object
+from structured_output import (
+    EVALUATION_INSTRUCTIONS, EVALUATION_SCHEMA, QUESTIONS_INSTRUCTIONS, QUESTIONS_SCHEMA,
+    StructuredSupport, completion_options, decode_evaluation, decode_questions
+)
+
+QUESTION_COUNT = 5
+
+EVALUATION_FORMAT = """
+        Provide a structured evaluation in this exact JSON format:
+        {
+            "overall_score": <number between 1-10>,
+            "technical_competency": <number between 1-10>,
+            "problem_solving": <number between 1-10>,
+            "communication": <number between 1-10>,
+            "experience_level": <number between 1-10>,
+            "cultural_fit": <number between 1-10>,
+            "strengths": ["strength1", "strength2"],
+            "areas_for_improvement": ["area1", "area2"],
+            "hiring_recommendation": "<strong yes/yes/maybe/no>",
+            "detailed_feedback": "<your comprehensive evaluation>"
+        }
+
+        Ensure your response is valid JSON and includes all fields.
+        """
+
+
+class AsyncOpenAIClient:
+    """
+    Async wrapper for OpenAI-compatible chat completions.
+
+    All calls share the client's HTTP connection pool; a call in flight is a suspended
+    coroutine, not a blocked thread. The pool belongs to the event loop it was opened on,
+    so the AsyncOpenAI client is created on first use and again whenever calls come from
+    a new loop (e.g. each asyncio.run of a console interview).
+
+    Attributes:
+        client (AsyncOpenAI): The async OpenAI client for the current event loop, or
+            None before the first call
+    """
+
+    def __init__(self, api_key, base_url):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.client = None
+        self._loop = None
+
+    async def create_completion(self, model, messages, **kwargs):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            from openai import AsyncOpenAI
+            self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+            self._loop = loop
+        return await self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+
+
+def questions_prompt(job_role: str) -> str:
+    return f"""
+        Generate {QUESTION_COUNT} unique interview questions for a {job_role} position.
+        Mix of:
+        - Technical skills for {job_role}
+        - Problem-solving scenarios
+        - System design (if applicable)
+        - Team collaboration
+        - Past experience
+
+        Make questions specific to {job_role} and avoid generic questions.
+        Please make the questions short and small, I mean do not make it too long
+        """
+
+
+def fallback_questions(job_role: str) -> List[str]:
+    return [
+        f"What makes you a strong candidate for this {job_role} position?",
+        "Tell me about a challenging project you worked on recently.",
+        "How do you approach learning new technologies?",
+        "Describe your experience with team collaboration.",
+        "What are your career goals?"
+    ]
+
+
+def parse_questions(raw_response: str) -> List[str]:
+    """
+    Parse a JSON array of questions from a model reply, tolerating code fences.
+
+    Raises:
+        ValueError: If the reply holds fewer than QUESTION_COUNT questions
+    """
+    json_str = raw_response.strip()
+    if '```' in json_str:
+        json_str = json_str.split('```')[1].strip()
+        if json_str.startswith('json'):
+            json_str = json_str[4:].strip()
+    questions = json.loads(json_str)
+    if len(questions) < QUESTION_COUNT:
+        raise ValueError("Not enough questions generated")
+    return questions[:QUESTION_COUNT]
+
+
+def evaluation_prompt(job_role: str, interview_data: List[Dict]) -> str:
+    return f"""
+        As an expert hiring manager, evaluate this candidate for a {job_role} position.
+
+        Here are their interview responses:
+
+        {'-' * 40}
+        """ + "\n".join([
+            f"Q{i+1}: {response['question']}\n"
+            f"A: {response['response']}\n"
+            for i, response in enumerate(interview_data)
+        ]) + f"""
+        {'-' * 40}
+        """
+
+
+def fallback_evaluation(error: Exception) -> Dict:
+    evaluation = dict(FALLBACK_VALUES)
+    evaluation["detailed_feedback"] = f"Error processing evaluation: {str(error)}"
+    return evaluation
+
+
+class InterviewEngine:
+    """
+    Question generation, follow-ups and evaluation for every interviewer frontend.
+
+    Speech is plugged in through async hooks so the engine stays independent of the
+    audio stack: ``stt(source, on_partial=None)`` returns the transcript of an answer
+    (``source`` is whatever the frontend records into, e.g. a file path, or None for a
+    live microphone) and ``tts(text)`` speaks or synthesizes a prompt.
+
+    Attributes:
+        client (AsyncOpenAIClient): Async client for model calls
+        router (ModelRouter): Picks the model used for each interview stage
+        sharded_evaluation (bool): Evaluate with concurrent per-dimension prompts
+        structured (StructuredSupport): Whether to ask for compact schema-constrained
+            JSON first; turned off after the provider rejects a structured request
+        stt (Callable): Async speech-to-text hook, or None
+        tts (Callable): Async text-to-speech hook, or None
+    """
+
+    def __init__(self, client, router=None, sharded_evaluation=False, structured_output=False,
+                 stt: Optional[Callable[..., Awaitable[Optional[str]]]] = None,
+                 tts: Optional[Callable[[str], Awaitable]] = None):
+        self.client = client
+        self.router = router or ModelRouter.from_env()
+        self.sharded_evaluation = sharded_evaluation
+        self.structured = StructuredSupport(structured_output)
+        self.stt = stt
+        self.tts = tts
+
+    async def generate_questions(self, job_role: str) -> List[str]:
+        """
+        Generate interview questions for a role.
+
+        Tries the structured prompt (if enabled), then the free-form prompt, then a
+        simpler backup prompt, and finally a fixed list, so it always returns questions.
+
+        Returns:
+            List[str]: QUESTION_COUNT interview questions
+        """
+        prompt = questions_prompt(job_role)
+        timestamp = f"\nTimestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}"
+        if self.structured.enabled:
+            try:
+                response = await self.router.create_completion(
+                    self.client, "questions",
+                    [{"role": "user", "content": prompt + QUESTIONS_INSTRUCTIONS + timestamp}],
+                    **completion_options("questions", QUESTIONS_SCHEMA)
+                )
+                return decode_questions(response.choices[0].message.content)
+            except Exception as e:
+                self.structured.failed(e)  # rejected schema or bad reply: use the free-form prompt
+        prompt += """
+        Format your response as a JSON array of questions only:
+        ["question1", "question2", "question3", "question4", "question5"]
+        """
+        try:
+            response = await self.router.create_completion(
+                self.client, "questions",
+                [{"role": "user", "content": prompt + timestamp}]
+            )
+            return parse_questions(response.choices[0].message.content)
+        except Exception as e:
+            print(f"Error generating questions: {str(e)}")
+        # Try a simpler prompt as a backup
+        prompt = (f"List {QUESTION_COUNT} interview questions for a {job_role} position. "
+                  "Return only the questions as a JSON array. "
+                  "Please make the questions short and small, I mean do not make it too long")
+        try:
+            response = await self.router.create_completion(
+                self.client, "dynamic_questions",
+                [{"role": "user", "content": prompt}]
+            )
+            return parse_questions(response.choices[0].message.content)
+        except Exception:
+            return fallback_questions(job_role)
+
+    async def evaluate_interview(self, job_role: str, interview_data: List[Dict]) -> Dict:
+        """
+        Evaluate candidate responses and generate comprehensive feedback.
+
+        Args:
+            job_role (str): The position being interviewed for
+            interview_data (List[Dict]): List of question-response pairs
+
+        Returns:
+            Dict: Structured evaluation including scores and feedback; fallback values
+            are used for anything the model did not provide
+        """
+        if self.sharded_evaluation:
+            return await evaluate_sharded(self.router, self.client, job_role, interview_data,
+                                          self.structured)
+        prompt = evaluation_prompt(job_role, interview_data)
+        if self.structured.enabled:
+            try:
+                response = await self.router.create_completion(
+                    self.client, "evaluation",
+                    [{"role": "user", "content": prompt + EVALUATION_INSTRUCTIONS}],
+                    **completion_options("evaluation", EVALUATION_SCHEMA)
+                )
+                return decode_evaluation(response.choices[0].message.content)
+            except Exception as e:
+                self.structured.failed(e)  # rejected schema or bad reply: use the free-form prompt
+        try:
+            response = await self.router.create_completion(
+                self.client, "evaluation",
+                [{"role": "user", "content": prompt + EVALUATION_FORMAT}]
+            )
+            evaluation = parse_json_object(response.choices[0].message.content)
+        except Exception as e:
+            print(f"Error evaluating interview: {str(e)}")
+            return fallback_evaluation(e)
+        for field in FALLBACK_VALUES:
+            evaluation.setdefault(field, "Not provided" if field != "overall_score" else 5)
+        return evaluation
+
+    async def generate_follow_up(self, job_role: str, question: str, answer: str) -> Optional[str]:
+        """
+        Ask the model for a follow-up question to a (possibly partial) answer.
+
+        Returns:
+            Optional[str]: The follow-up question, or None if the model declined or failed
+        """
+        try:
+            response = await self.router.create_completion(
+                self.client, "follow_up",
+                [{"role": "user", "content": follow_up_prompt(job_role, question, answer)}]
+            )
+            return parse_follow_up(response.choices[0].message.content)
+        except Exception as e:
+            print(f"Error generating follow-up question: {e}")
+            return None
+
+    def speculate_follow_up(self, job_role: str, question: str,
+                            loop: asyncio.AbstractEventLoop) -> SpeculativeFollowUp:
+        """
+        Start drafting follow-ups for an answer in progress.
+
+        The drafts run as coroutines on ``loop``; the returned object's ``update`` may be
+        called from any thread, and its blocking ``resolve`` from any thread but the loop's.
+        """
+        def submit(answer: str) -> Future:
+            return asyncio.run_coroutine_threadsafe(self.generate_follow_up(job_role, question, answer), loop)
+        return SpeculativeFollowUp(submit, question)
+
+    async def transcribe(self, source=None, on_partial: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        if self.stt is None:
+            raise RuntimeError("No speech-to-text hook configured")
+        return await self.stt(source, on_partial=on_partial)
+
+    async def speak(self, text: str):
+        if self.tts is None:
+            raise RuntimeError("No text-to-speech hook configured")
+        return await self.tts(text)
+
+    async def run_questions(self, job_role: str, questions: List[str],
+                            ask: Callable[[int, str], Awaitable],
+                            answer: Callable[[Optional[Callable[[str], None]]], Awaitable[str]],
+                            adaptive: bool = False, max_follow_ups: int = 2) -> List[Dict]:
+        """
+        Ask every question and collect the answers, adding follow-ups after thin answers.
+
+        Args:
+            job_role (str): The position being interviewed for
+            questions (List[str]): Questions to ask; follow-ups are inserted into a copy
+            ask (Callable): ``await ask(index, question)`` presents a question
+            answer (Callable): ``await answer(on_partial)`` returns the candidate's answer;
+                ``on_partial`` (None unless a follow-up is being drafted) takes the
+                transcript so far
+            adaptive (bool): Draft and ask follow-up questions
+            max_follow_ups (int): Most follow-ups per interview; follow-ups are never
+                followed up
+
+        Returns:
+            List[Dict]: Question-response pairs in the order asked
+        """
+        loop = asyncio.get_running_loop()
+        questions = list(questions)
+        follow_ups = set()
+        interview_responses = []
+        i = 0
+        while i < len(questions):
+            question = questions[i]
+            await ask(i, question)
+            speculation = None
+            if adaptive and i not in follow_ups and len(follow_ups) < max_follow_ups:
+                speculation = self.speculate_follow_up(job_role, question, loop)
+            response = await answer(speculation.update if speculation else None)
+            interview_responses.append({"question": question, "response": response})
+            if speculation is not None:
+                # resolve() blocks on drafts scheduled on this loop, so wait for it off the loop
+                follow_up = await asyncio.to_thread(speculation.resolve, response)
+                if follow_up:
+                    questions.insert(i + 1, follow_up)
+                    follow_ups.add(i + 1)
+            i += 1
+        return interview_responses
+
+    async def run_scripted_interview(self, job_role: str, answers: List[str]) -> Dict:
+        """
+        Run an interview headlessly with pre-written answers.
+
+        Args:
+            job_role (str): The position being interviewed for
+            answers (List[str]): Candidate answers, in question order; missing
+                answers are recorded as empty responses
+
+        Returns:
+            Dict: The result in the same shape the CLI interviewers save, plus a
+            "latency" entry with per-stage timings in seconds
+        """
+        start = time.monotonic()
+        questions = await self.generate_questions(job_role)
+        questions_done = time.monotonic()
+
+        interview_responses = [
+            {"question": question, "response": answers[i] if i < len(answers) else ""}
+            for i, question in enumerate(questions)
+        ]
+        evaluation = await self.evaluate_interview(job_role, interview_responses)
+        end = time.monotonic()
+
+        return {
+            "job_role": job_role,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "interview_responses": interview_responses,
+            "evaluation": evaluation,
+            "latency": {
+                "questions": round(questions_done - start, 3),
+                "evaluation": round(end - questions_done, 3),
+                "total": round(end - start, 3)
+            }
+        }
+
+
+class EngineLoop:
+    """
+    A single event loop on a background thread for synchronous callers (e.g. Flask views).
+
+    Every engine call submitted here shares one loop and one connection pool, however
+    many request threads are waiting on results.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls) -> "EngineLoop":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the loop and block the calling thread until it finishes."""
+        return self.submit(coro).result(timeout)
@@ -0,0 +1,225 @@
+"""
+Per-stage model routing for the AI interviewer.
+This module picks the LLM used for each interview stage from configuration and
+moves traffic to an alternate model when the preferred one is slow or failing.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Stages used by the interviewers. Each stage has a preferred model, an ordered
+# list of alternates and a latency SLO in seconds.
+DEFAULT_ROUTES = {
+    "questions": {
+        "model": "gemini-2.0-flash-exp",
+        "alternates": ["gemini-2.0-flash-lite"],
+        "latency_slo": 4.0,
+    },
+    "dynamic_questions": {
+        "model": "gemini-2.0-flash-exp",
+        "alternates": ["gemini-2.0-flash-lite"],
+        "latency_slo": 4.0,
+    },
+    "follow_up": {
+        "model": "gemini-2.0-flash-exp",
+        "alternates": ["gemini-2.0-flash-lite"],
+        "latency_slo": 3.0,
+    },
+    "evaluation": {
+        "model": "gemini-2.0-flash-exp",
+        "alternates": ["gemini-2.0-flash"],
+        "latency_slo": 15.0,
+    },
+}
+
+ROUTES_ENV_VAR = "INTERVIEW_MODEL_ROUTES"
+
+# HTTP statuses for a request the provider refused as malformed or unsupported
+REQUEST_ERROR_STATUSES = (400, 422)
+
+
+def is_request_error(error: Exception) -> bool:
+    """
+    Whether an error is the provider rejecting the request itself (e.g. an unsupported
+    parameter) rather than the model failing to serve it.
+    """
+    return getattr(error, "status_code", None) in REQUEST_ERROR_STATUSES
+
+
+class ModelStats:
+    """
+    Rolling latency and error statistics for a single model.
+
+    Attributes:
+        samples (deque): Last ``window`` calls as (latency_seconds, ok) tuples
+        tripped_at (float): Time the model was taken out of rotation, or None
+    """
+
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)
+        self.tripped_at = None
+
+    def record(self, latency: float, ok: bool):
+        self.samples.append((latency, ok))
+
+    def latency_percentile(self, percentile: float) -> float:
+        latencies = sorted(latency for latency, ok in self.samples if ok)
+        if not latencies:
+            return 0.0
+        index = min(len(latencies) - 1, int(round(percentile * (len(latencies) - 1))))
+        return latencies[index]
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def snapshot(self) -> Dict:
+        return {
+            "calls": len(self.samples),
+            "p90_latency": round(self.latency_percentile(0.9), 3),
+            "error_rate": round(self.error_rate(), 3),
+            "tripped": self.tripped_at is not None,
+        }
+
+
+class ModelRouter:
+    """
+    Chooses a model for each interview stage and tracks how each model performs.
+
+    Statistics are kept per (stage, model), since each SLO belongs to a stage: a model
+    that is slow on long evaluations can still be fast enough for question generation.
+    A model that breaks a stage's latency SLO (p90 over the rolling window) or exceeds
+    the allowed error rate is skipped for that stage for ``cooldown`` seconds, after
+    which it is probed again with a fresh window.
+
+    Attributes:
+        routes (dict): Stage name -> {"model", "alternates", "latency_slo"}
+        window (int): Number of recent calls kept per model
+        min_samples (int): Calls required before a model can be tripped
+        max_error_rate (float): Error rate above which a model is tripped
+        cooldown (float): Seconds a tripped model stays out of rotation
+    """
+
+    def __init__(self, routes: Optional[Dict] = None, window: int = 20, min_samples: int = 5,
+                 max_error_rate: float = 0.25, cooldown: float = 60.0):
+        self.routes = {stage: dict(route) for stage, route in DEFAULT_ROUTES.items()}
+        for stage, route in (routes or {}).items():
+            self.routes.setdefault(stage, {"alternates": [], "latency_slo": None})
+            self.routes[stage].update(route)
+        self.window = window
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ModelRouter":
+        """
+        Build a router from a JSON file.
+
+        The file holds a "routes" mapping in the same shape as DEFAULT_ROUTES and
+        may also set "window", "min_samples", "max_error_rate" and "cooldown".
+        """
+        with open(path, "r") as f:
+            config = json.load(f)
+        for key in ("window", "min_samples", "max_error_rate", "cooldown"):
+            if key in config:
+                kwargs.setdefault(key, config[key])
+        return cls(routes=config.get("routes"), **kwargs)
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        """Build a router from the file named by INTERVIEW_MODEL_ROUTES, or the defaults."""
+        path = os.environ.get(ROUTES_ENV_VAR)
+        if path and os.path.exists(path):
+            return cls.from_file(path)
+        return cls()
+
+    def candidates(self, stage: str) -> List[str]:
+        route = self.routes[stage]
+        return [route["model"]] + [m for m in route.get("alternates", []) if m != route["model"]]
+
+    def select(self, stage: str) -> str:
+        """
+        Return the first healthy model for a stage, falling back to the preferred one.
+        """
+        models = self.candidates(stage)
+        now = time.monotonic()
+        with self._lock:
+            for model in models:
+                if self._is_available(stage, model, now):
+                    return model
+        return models[0]
+
+    def record(self, stage: str, model: str, latency: float, ok: bool):
+        """
+        Record the outcome of a call and trip the model if it broke the stage's limits.
+        """
+        slo = self.routes[stage].get("latency_slo")
+        with self._lock:
+            stats = self._stats_for(stage, model)
+            stats.record(latency, ok)
+            if stats.tripped_at is not None or len(stats.samples) < self.min_samples:
+                return
+            too_slow = slo is not None and stats.latency_percentile(0.9) > slo
+            if too_slow or stats.error_rate() > self.max_error_rate:
+                stats.tripped_at = time.monotonic()
+
+    async def create_completion(self, client, stage: str, messages: List[Dict], **kwargs):
+        """
+        Run a chat completion for a stage on the routed model.
+
+        Args:
+            client (AsyncOpenAIClient): Client whose create_completion is a coroutine
+            stage (str): Interview stage, e.g. "questions" or "evaluation"
+            messages (list): List of message dictionaries
+
+        Returns:
+            OpenAI completion response
+
+        Raises:
+            Exception: Whatever the client raised. The failure is recorded first, unless
+                the provider rejected the request itself, which says nothing about the
+                model's health
+        """
+        model = self.select(stage)
+        start = time.monotonic()
+        try:
+            response = await client.create_completion(model=model, messages=messages, **kwargs)
+        except Exception as e:
+            if not is_request_error(e):
+                self.record(stage, model, time.monotonic() - start, ok=False)
+            raise
+        self.record(stage, model, time.monotonic() - start, ok=True)
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Dict]]:
+        """Snapshot of every model's numbers, as {stage: {model: snapshot}}."""
+        snapshot = {}
+        with self._lock:
+            for (stage, model), stats in self._stats.items():
+                snapshot.setdefault(stage, {})[model] = stats.snapshot()
+        return snapshot
+
+    def _stats_for(self, stage: str, model: str) -> ModelStats:
+        key = (stage, model)
+        if key not in self._stats:
+            self._stats[key] = ModelStats(self.window)
+        return self._stats[key]
+
+    def _is_available(self, stage: str, model: str, now: float) -> bool:
+        stats = self._stats.get((stage, model))
+        if stats is None or stats.tripped_at is None:
+            return True
+        if now - stats.tripped_at < self.cooldown:
+            return False
+        # Cooldown over: probe the model again with a clean window
+        stats.samples.clear()
+        stats.tripped_at = None
+        return True
@@ -0,0 +1,216 @@
+"""
+Write-behind persistence for interview results.
+This module queues result writes to a background thread, gives every result a unique id,
+and writes each file as temp file + fsync + atomic rename so readers never see a partial
+result and two interviews finishing in the same second cannot overwrite each other.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def new_result_id() -> str:
+    """Time-sortable unique id, e.g. 20250704_031703_3f9c2a1b."""
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def _write_temp(path: str, data: str, sync: bool) -> str:
+    directory, name = os.path.split(path)
+    # Hidden .tmp name so result globs never match a half-written file
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def write_atomic(path: str, data: str, sync: bool = True):
+    """
+    Write ``data`` to ``path`` through a temp file in the same directory and an atomic rename.
+    """
+    os.replace(_write_temp(path, data, sync), path)
+
+
+def _fsync_file(path: str):
+    with open(path, "a") as f:
+        os.fsync(f.fileno())
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _fsync_directory(directory: str):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Not supported on this platform (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ResultWriter:
+    """
+    Background writer for interview result files.
+
+    ``save`` returns the file path immediately; the write happens on a worker thread.
+    Queued results are written in batches of up to ``batch_size``, with one directory
+    fsync per batch so a burst of results costs one metadata sync instead of one each.
+    By default every file is fsynced as soon as it is written; with ``batch_sync`` the
+    whole batch is written first and its temp files are fsynced afterwards, so the
+    kernel writes the batch back together and each fsync mostly waits on I/O that is
+    already in flight. Only the batch's own files are synced, never the whole
+    filesystem, and either way no file is renamed into place before its data is on disk.
+
+    A write that fails is queued again up to ``max_retries`` times. A result that still
+    cannot be written is reported to ``on_error(path, error)`` (printed by default) and
+    returned by the next ``flush``. Everything still queued is written on ``close``,
+    which also runs at interpreter exit.
+
+    Attributes:
+        result_dir (str): Directory result files are written to
+        batch_size (int): Maximum results written per directory fsync
+        batch_sync (bool): Write the whole batch before fsyncing its files
+        max_retries (int): Extra attempts for a write that failed
+        retry_delay (float): Seconds to wait before retrying a failed write
+        on_error (Callable[[str, OSError], None]): Called for a result that could not
+            be written, or None to print it
+    """
+
+    def __init__(self, result_dir: str = "Result", batch_size: int = 16, batch_sync: bool = False,
+                 max_retries: int = 3, retry_delay: float = 0.5,
+                 on_error: Optional[Callable[[str, OSError], None]] = None):
+        self.result_dir = result_dir
+        self.batch_size = batch_size
+        self.batch_sync = batch_sync
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_error = on_error
+        self._queue = queue.Queue()
+        self._failures = []
+        self._failures_lock = threading.Lock()
+        self._closed = False
+        os.makedirs(result_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def path_for(self, result_id: str) -> str:
+        return os.path.join(self.result_dir, f"interview_results_{result_id}.json")
+
+    def save(self, result: Dict, result_id: Optional[str] = None) -> str:
+        """
+        Queue a result for writing.
+
+        Args:
+            result (Dict): JSON-serializable interview result
+            result_id (str): Id to use; a new unique id is generated when omitted
+
+        Returns:
+            str: Path the result is queued to be written to
+        """
+        if self._closed:
+            raise RuntimeError("ResultWriter is closed")
+        path = self.path_for(result_id or new_result_id())
+        # Serialize now so later changes to the caller's dict can't leak into the file
+        self._queue.put((path, json.dumps(result, indent=2), 0))
+        return path
+
+    def flush(self) -> List[Tuple[str, OSError]]:
+        """
+        Block until every queued result is on disk or has failed for good.
+
+        Returns:
+            List[Tuple[str, OSError]]: Results that could not be written since the last
+            flush, as (path, last error)
+        """
+        self._queue.join()
+        with self._failures_lock:
+            failures, self._failures = self._failures, []
+        return failures
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            self._write_batch([entry for entry in batch if entry is not None])
+            closing = batch[-1] is None
+            if closing and not self._queue.empty():
+                self._queue.put(None)  # Retries were queued behind the close: write them first
+                closing = False
+            for _ in batch:
+                self._queue.task_done()
+            if closing:
+                return
+
+    def _write_batch(self, batch: List[Tuple[str, str, int]]):
+        if any(attempt for _, _, attempt in batch):
+            time.sleep(self.retry_delay)
+        written = []
+        for entry in batch:
+            try:
+                written.append((entry, _write_temp(entry[0], entry[1], sync=not self.batch_sync)))
+            except OSError as e:
+                self._failed(entry, e)
+        if self.batch_sync:
+            synced = []
+            for entry, tmp_path in written:
+                try:
+                    _fsync_file(tmp_path)
+                except OSError as e:
+                    _discard(tmp_path)
+                    self._failed(entry, e)
+                    continue
+                synced.append((entry, tmp_path))
+            written = synced
+        for entry, tmp_path in written:
+            try:
+                os.replace(tmp_path, entry[0])
+            except OSError as e:
+                _discard(tmp_path)
+                self._failed(entry, e)
+        if written:
+            _fsync_directory(self.result_dir)
+
+    def _failed(self, entry: Tuple[str, str, int], error: OSError):
+        path, data, attempt = entry
+        if attempt < self.max_retries:
+            self._queue.put((path, data, attempt + 1))
+            return
+        with self._failures_lock:
+            self._failures.append((path, error))
+        if self.on_error is not None:
+            self.on_error(path, error)
+        else:
+            print(f"Error saving result {path}: {error}")
@@ -0,0 +1,166 @@
+"""
+Incrementally maintained percentile index over historical interview scores.
+This module keeps, per job role and score dimension, a sorted list of past scores so a new
+evaluation can be ranked against its role's history without rescanning Result/.
+"""
+
+import glob
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+from analytics import MISSING, SCORE_FIELDS, normalize_label, parse_score
+
+INDEX_FILENAME = "score_index.jsonl"
+
+
+class ScoreIndex:
+    """
+    Per-role, per-dimension sorted score index backed by an append-only log.
+
+    Every saved result appends one line to ``<result_dir>/score_index.jsonl``. The in-memory
+    index tails that log, so results saved by other processes (e.g. the CLI interviewers)
+    are picked up on the next query. The log is bootstrapped from Result/ only once, the
+    first time it is missing.
+
+    Attributes:
+        result_dir (str): Directory holding the result files and the index log
+        path (str): Path of the index log
+    """
+
+    def __init__(self, result_dir: str = "Result"):
+        self.result_dir = result_dir
+        self.path = os.path.join(result_dir, INDEX_FILENAME)
+        # (role, dimension) -> sorted list of (score, result_id)
+        self._entries: Dict[tuple, List[tuple]] = {}
+        self._seen = set()
+        self._offset = 0
+        self._lock = threading.Lock()
+        if not os.path.exists(self.path):
+            self._bootstrap()
+        self._refresh()
+
+    @staticmethod
+    def record(result_dir: str, result_id: str, job_role: str, evaluation: Dict):
+        """
+        Append a saved result to the index log without loading the index.
+
+        Used by processes that only write results. If the log does not exist yet the call
+        is a no-op: the one-off bootstrap scan will pick the result file up instead.
+        """
+        path = os.path.join(result_dir, INDEX_FILENAME)
+        if os.path.exists(path):
+            ScoreIndex._append(path, result_id, job_role, evaluation)
+
+    def add(self, result_id: str, job_role: str, evaluation: Dict):
+        """
+        Add a saved result to the index.
+
+        Args:
+            result_id (str): Identifier of the saved result (its file name)
+            job_role (str): The position interviewed for
+            evaluation (Dict): Evaluation returned by evaluate_interview
+        """
+        with self._lock:
+            self._append(self.path, result_id, job_role, evaluation)
+            self._refresh_locked()
+
+    def percentile(self, job_role: str, dimension: str, score) -> Optional[float]:
+        """
+        Percentile of ``score`` among the role's historical scores for a dimension.
+
+        Ties count as half below, so the median score of a role reports ~50.
+
+        Returns:
+            float: Percentile in [0, 100], or None if the role has no history
+        """
+        value = parse_score(score)
+        if value == MISSING:
+            return None
+        with self._lock:
+            self._refresh_locked()
+            entries = self._entries.get((normalize_label(job_role), dimension))
+            if not entries:
+                return None
+            below = bisect_left(entries, (value,))
+            at_or_below = bisect_left(entries, (value + 1,))
+            return round(100.0 * (below + (at_or_below - below) / 2) / len(entries), 1)
+
+    def percentiles(self, job_role: str, evaluation: Dict) -> Dict[str, Optional[float]]:
+        """Percentile of every score dimension of an evaluation against the role's history."""
+        return {field: self.percentile(job_role, field, evaluation.get(field)) for field in SCORE_FIELDS}
+
+    def top(self, job_role: str, dimension: str, k: int = 10) -> List[Dict]:
+        """
+        The ``k`` highest-scoring historical results for a role and dimension.
+        """
+        with self._lock:
+            self._refresh_locked()
+            entries = self._entries.get((normalize_label(job_role), dimension), [])
+            return [{"result_id": result_id, "score": score}
+                    for score, result_id in reversed(entries[-k:])] if k > 0 else []
+
+    def count(self, job_role: str, dimension: str = "overall_score") -> int:
+        with self._lock:
+            self._refresh_locked()
+            return len(self._entries.get((normalize_label(job_role), dimension), []))
+
+    @staticmethod
+    def _entry_line(result_id: str, job_role: str, evaluation: Dict) -> str:
+        return json.dumps({
+            "id": result_id,
+            "role": normalize_label(job_role),
+            "scores": [parse_score(evaluation.get(field)) for field in SCORE_FIELDS],
+        }) + "\n"
+
+    @staticmethod
+    def _append(path: str, result_id: str, job_role: str, evaluation: Dict):
+        # A single short O_APPEND write keeps lines from concurrent writers intact
+        with open(path, "a") as f:
+            f.write(ScoreIndex._entry_line(result_id, job_role, evaluation))
+
+    def _bootstrap(self):
+        os.makedirs(self.result_dir, exist_ok=True)
+        lines = []
+        for path in sorted(glob.glob(os.path.join(self.result_dir, "interview_results_*.json"))):
+            try:
+                with open(path, "r") as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                continue
+            lines.append(self._entry_line(
+                os.path.basename(path), result.get("job_role"), result.get("evaluation") or {}))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("".join(lines))
+        os.replace(tmp_path, self.path)
+
+    def _refresh(self):
+        with self._lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self):
+        try:
+            if os.path.getsize(self.path) <= self._offset:
+                return
+        except OSError:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        # Leave a partially written trailing line for the next refresh
+        end = chunk.rfind(b"\n") + 1
+        self._offset += end
+        for line in chunk[:end].decode().splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry["id"] in self._seen:
+                continue
+            self._seen.add(entry["id"])
+            for field, score in zip(SCORE_FIELDS, entry["scores"]):
+                if score != MISSING:
+                    insort(self._entries.setdefault((entry["role"], field), []), (score, entry["id"]))
@@ -0,0 +1,229 @@
+"""
+Silence-based segmentation of long answers with parallel transcription.
+This module cuts an answer into bounded chunks at pauses, transcribes the chunks at the
+same time on a worker pool and stitches the text back in order. Audio is consumed as it
+is read or heard, so at most a few chunks are held in memory per answer.
+"""
+
+import audioop
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import speech_recognition as sr
+
+# Segments are cut at the first pause after MIN_SEGMENT seconds and never exceed MAX_SEGMENT
+MIN_SEGMENT = 5.0
+MAX_SEGMENT = 30.0
+SEGMENT_PAUSE = 0.6
+
+
+class SegmentTranscriber:
+    """
+    Transcribes audio segments concurrently and joins the text in submission order.
+
+    Submitting blocks while ``max_in_flight`` segments are still waiting to be transcribed,
+    which bounds the audio held in memory.
+
+    Attributes:
+        recognizer (sr.Recognizer): Recognizer used for every segment
+        on_partial (Callable[[str], None]): Called with the transcript so far (the leading
+            segments that are done) each time it grows, from a worker thread
+    """
+
+    def __init__(self, recognizer: sr.Recognizer, workers: int = 4, max_in_flight: Optional[int] = None,
+                 on_partial: Optional[Callable[[str], None]] = None):
+        self.recognizer = recognizer
+        self.on_partial = on_partial
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_in_flight or workers * 2)
+        self._futures = []
+        self._lock = threading.Lock()
+        self._partial_count = 0
+
+    def submit(self, audio: sr.AudioData):
+        self._slots.acquire()
+        future = self._executor.submit(self._recognize, audio)
+        with self._lock:
+            self._futures.append(future)
+        future.add_done_callback(self._segment_done)
+
+    def _segment_done(self, _future):
+        self._slots.release()
+        if self.on_partial is None:
+            return
+        with self._lock:
+            done = 0
+            while done < len(self._futures) and self._futures[done].done():
+                done += 1
+            if done <= self._partial_count:
+                return
+            self._partial_count = done
+            futures = self._futures[:done]
+        texts = [f.result() for f in futures if not f.cancelled() and f.exception() is None]
+        text = " ".join(t for t in texts if t)
+        if text:
+            self.on_partial(text)
+
+    def result(self) -> str:
+        """
+        Wait for every segment and return the stitched transcript.
+
+        Raises:
+            sr.UnknownValueError: If no segment contained recognizable speech
+            sr.RequestError: If the recognition service could not be reached
+        """
+        try:
+            texts = [future.result() for future in self._futures]
+        finally:
+            self.close()
+        text = " ".join(t for t in texts if t)
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def close(self):
+        """
+        Abandon the answer: cancel segments not yet started and release the workers.
+        Recognitions already in flight finish in the background and are discarded.
+        Safe to call more than once, and after ``result``.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _recognize(self, audio: sr.AudioData) -> str:
+        try:
+            return self.recognizer.recognize_google(audio)
+        except sr.UnknownValueError:
+            return ""
+
+
+class PcmSegmenter:
+    """
+    Cuts a live stream of raw PCM into segments at pauses and submits them for transcription.
+
+    A segment is closed at the first SEGMENT_PAUSE of silence once it is MIN_SEGMENT long,
+    or unconditionally at MAX_SEGMENT. Each ``feed`` call is treated as one block when
+    measuring silence, so blocks should be short (tens of milliseconds).
+
+    Attributes:
+        transcriber (SegmentTranscriber): Receives every closed segment
+        sample_rate (int): Samples per second of the stream
+        sample_width (int): Bytes per sample (mono)
+        energy_threshold (float): RMS below which a block counts as silence
+    """
+
+    def __init__(self, transcriber: SegmentTranscriber, sample_rate: int, sample_width: int,
+                 energy_threshold: float):
+        self.transcriber = transcriber
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.energy_threshold = energy_threshold
+        self._segment = bytearray()
+        self._segment_seconds = 0.0
+        self._silent_seconds = 0.0
+
+    def feed(self, block: bytes):
+        if not block:
+            return
+        seconds = len(block) / (self.sample_rate * self.sample_width)
+        self._segment.extend(block)
+        self._segment_seconds += seconds
+        if audioop.rms(block, self.sample_width) < self.energy_threshold:
+            self._silent_seconds += seconds
+        else:
+            self._silent_seconds = 0.0
+        at_pause = self._segment_seconds >= MIN_SEGMENT and self._silent_seconds >= SEGMENT_PAUSE
+        if at_pause or self._segment_seconds >= MAX_SEGMENT:
+            self.flush()
+
+    def flush(self):
+        """Submit whatever is buffered as a segment."""
+        if self._segment:
+            self.transcriber.submit(sr.AudioData(bytes(self._segment), self.sample_rate, self.sample_width))
+            self._segment.clear()
+        self._segment_seconds = self._silent_seconds = 0.0
+
+
+def transcribe_file(path: str, recognizer: Optional[sr.Recognizer] = None, workers: int = 4,
+                    on_partial: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Transcribe an audio file chunk by chunk without loading it whole.
+
+    The file is read block by block and cut into segments at pauses (see PcmSegmenter);
+    each segment is handed to the worker pool straight away.
+
+    Args:
+        path (str): WAV, AIFF or FLAC file
+        recognizer (sr.Recognizer): Recognizer to use; its energy_threshold marks silence
+        workers (int): Segments transcribed at the same time
+        on_partial (Callable[[str], None]): Called with the transcript so far as the
+            leading segments finish
+
+    Returns:
+        str: The transcript, or "" if nothing was recognized
+    """
+    recognizer = recognizer or sr.Recognizer()
+    transcriber = SegmentTranscriber(recognizer, workers=workers, on_partial=on_partial)
+    try:
+        with sr.AudioFile(path) as source:
+            segmenter = PcmSegmenter(transcriber, source.SAMPLE_RATE, source.SAMPLE_WIDTH,
+                                     recognizer.energy_threshold)
+            while True:
+                block = source.stream.read(source.CHUNK)
+                if not block:
+                    break
+                segmenter.feed(block)
+            segmenter.flush()
+        return transcriber.result()
+    except sr.UnknownValueError:
+        return ""
+    finally:
+        # Unreadable audio leaves the pool running otherwise
+        transcriber.close()
+
+
+def listen_segmented(recognizer: sr.Recognizer, source, end_pause: float, workers: int = 4,
+                     on_partial: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Listen to a live source and transcribe the answer while the candidate is still talking.
+
+    Each phrase ends after SEGMENT_PAUSE of silence (or MAX_SEGMENT of speech) and is sent
+    for transcription immediately. The answer ends when no new phrase starts within
+    ``end_pause`` seconds of the previous one.
+
+    Args:
+        recognizer (sr.Recognizer): Recognizer, already calibrated for the source
+        source (sr.AudioSource): Open microphone or other live source
+        end_pause (float): Total silence, in seconds, that ends the answer
+        on_partial (Callable[[str], None]): Called with the transcript so far while the
+            candidate is still talking
+
+    Returns:
+        str: The stitched transcript
+
+    Raises:
+        sr.UnknownValueError: If nothing recognizable was said
+        sr.RequestError: If the recognition service could not be reached
+    """
+    transcriber = SegmentTranscriber(recognizer, workers=workers, on_partial=on_partial)
+    pause_threshold, non_speaking_duration = recognizer.pause_threshold, recognizer.non_speaking_duration
+    recognizer.pause_threshold = SEGMENT_PAUSE
+    # listen() requires non_speaking_duration <= pause_threshold
+    recognizer.non_speaking_duration = min(non_speaking_duration, SEGMENT_PAUSE)
+    try:
+        # Wait as long as needed for the answer to start
+        transcriber.submit(recognizer.listen(source, timeout=None, phrase_time_limit=MAX_SEGMENT))
+        while True:
+            try:
+                audio = recognizer.listen(source, timeout=max(end_pause - SEGMENT_PAUSE, 0.1),
+                                          phrase_time_limit=MAX_SEGMENT)
+            except sr.WaitTimeoutError:
+                break
+            transcriber.submit(audio)
+    except BaseException:
+        transcriber.close()
+        raise
+    finally:
+        recognizer.pause_threshold = pause_threshold
+        recognizer.non_speaking_duration = non_speaking_duration
+    return transcriber.result()
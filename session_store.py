@@ -0,0 +1,148 @@
+"""
+Bounded in-memory storage for live web interview sessions.
+This module keeps each session in a compact slotted object, evicts sessions that have
+been idle longer than a TTL and refuses new sessions past a hard cap, so abandoned
+interviews cannot grow a long-running server's memory without bound.
+"""
+
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when the store already holds ``max_sessions`` live sessions."""
+
+
+class InterviewSession:
+    """
+    State of one web interview.
+
+    Attributes:
+        session_id (str): Id handed to the browser
+        job_role (str): The position being interviewed for
+        questions (List[str]): Questions, including follow-ups inserted so far
+        answers (List[Dict]): Question-response pairs recorded so far
+        current_index (int): Index of the question being answered
+        follow_ups (List[int]): Indices of the follow-up questions
+        lock (threading.Lock): Held while an answer is being recorded
+        last_active (float): Monotonic time of the last access
+    """
+
+    __slots__ = ("session_id", "job_role", "questions", "answers", "current_index",
+                 "follow_ups", "lock", "last_active")
+
+    def __init__(self, job_role: str, questions: List[str], session_id: Optional[str] = None):
+        self.session_id = session_id or str(uuid.uuid4())
+        self.job_role = job_role
+        self.questions = questions
+        self.answers = []
+        self.current_index = 0
+        self.follow_ups = []
+        self.lock = threading.Lock()
+        self.last_active = time.monotonic()
+
+    def approx_bytes(self) -> int:
+        """Rough memory footprint: the object, its lists and the strings they hold."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.session_id) + sys.getsizeof(self.job_role)
+        size += sys.getsizeof(self.questions) + sum(sys.getsizeof(q) for q in self.questions)
+        size += sys.getsizeof(self.answers) + sys.getsizeof(self.follow_ups)
+        for answer in self.answers:
+            size += sys.getsizeof(answer) + sum(sys.getsizeof(v) for v in answer.values())
+        return size
+
+
+class SessionStore:
+    """
+    Thread-safe map of live sessions with idle expiry and a hard cap.
+
+    A background thread evicts sessions idle for more than ``ttl`` seconds every
+    ``sweep_interval`` seconds. A session that is recording an answer (its lock is held)
+    is never evicted.
+
+    Attributes:
+        ttl (float): Seconds a session may stay idle before it is evicted
+        max_sessions (int): Most live sessions; ``add`` raises SessionLimitError beyond it
+        evicted (int): Sessions evicted for idleness since start
+    """
+
+    def __init__(self, ttl: float = 1800, max_sessions: int = 1000, sweep_interval: float = 60):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self.evicted = 0
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sweep, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def ensure_capacity(self):
+        """Raise SessionLimitError now if a new session could not be added."""
+        with self._lock:
+            self._check_capacity()
+
+    def add(self, session: InterviewSession) -> InterviewSession:
+        with self._lock:
+            self._check_capacity()
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        """Return the live session and mark it active, or None if unknown or expired."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_active = time.monotonic()
+            return session
+
+    def remove(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            return self._evict_expired()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "live_sessions": len(sessions),
+            "approx_bytes": sum(session.approx_bytes() for session in sessions),
+            "max_sessions": self.max_sessions,
+            "ttl": self.ttl,
+            "evicted": self.evicted,
+        }
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _check_capacity(self):
+        # Called with the lock held; frees idle sessions before refusing a new one
+        if len(self._sessions) >= self.max_sessions:
+            self._evict_expired()
+        if len(self._sessions) >= self.max_sessions:
+            raise SessionLimitError(f"{self.max_sessions} interviews are already in progress")
+
+    def _evict_expired(self) -> int:
+        # Called with the lock held
+        cutoff = time.monotonic() - self.ttl
+        expired = [
+            session_id for session_id, session in self._sessions.items()
+            if session.last_active < cutoff and not session.lock.locked()
+        ]
+        for session_id in expired:
+            del self._sessions[session_id]
+        self.evicted += len(expired)
+        return len(expired)
+
+    def _sweep(self):
+        while not self._stop.wait(self.sweep_interval):
+            self.evict_expired()
@@ -0,0 +1,184 @@
+"""
+Sharded interview evaluation.
+This module splits the single evaluation prompt into independent, smaller prompts (one per
+group of dimensions plus the narrative feedback), sends them concurrently and merges the
+answers back into the usual evaluation schema, so wall-clock time is the slowest shard
+rather than the whole generated output.
+"""
+
+import asyncio
+import json
+import re
+from typing import Dict, List, Optional
+
+from structured_output import (
+    StructuredSupport, completion_options, decode_evaluation, evaluation_instructions, evaluation_schema
+)
+
+# Shard name -> (fields it produces, JSON template shown to the model)
+SHARDS = {
+    "technical": (
+        ["technical_competency", "problem_solving"],
+        '''{
+            "technical_competency": <number between 1-10>,
+            "problem_solving": <number between 1-10>
+        }''',
+    ),
+    "communication": (
+        ["communication", "cultural_fit"],
+        '''{
+            "communication": <number between 1-10>,
+            "cultural_fit": <number between 1-10>
+        }''',
+    ),
+    "experience": (
+        ["experience_level"],
+        '''{
+            "experience_level": <number between 1-10>
+        }''',
+    ),
+    "narrative": (
+        ["overall_score", "strengths", "areas_for_improvement", "hiring_recommendation", "detailed_feedback"],
+        '''{
+            "overall_score": <number between 1-10>,
+            "strengths": ["strength1", "strength2"],
+            "areas_for_improvement": ["area1", "area2"],
+            "hiring_recommendation": "<strong yes/yes/maybe/no>",
+            "detailed_feedback": "<your comprehensive evaluation>"
+        }''',
+    ),
+}
+
+# Completion token cap per shard in structured mode: score shards reply with a couple
+# of integers, only the narrative shard writes prose
+SHARD_MAX_TOKENS = {
+    "technical": 40,
+    "communication": 40,
+    "experience": 30,
+    "narrative": 600,
+}
+
+# Used for a field a shard did not return, or for every field of a shard that failed
+FALLBACK_VALUES = {
+    "overall_score": 5,
+    "technical_competency": 5,
+    "problem_solving": 5,
+    "communication": 5,
+    "experience_level": 5,
+    "cultural_fit": 5,
+    "strengths": ["Unable to determine strengths"],
+    "areas_for_improvement": ["Unable to determine areas for improvement"],
+    "hiring_recommendation": "maybe",
+    "detailed_feedback": "Not provided",
+}
+
+
+def parse_json_object(raw_response: str) -> Dict:
+    """
+    Parse a JSON object from a model reply, tolerating code fences and surrounding prose.
+    """
+    try:
+        return json.loads(raw_response)
+    except json.JSONDecodeError:
+        json_match = re.search(r'```json\s*(.*?)\s*```', raw_response, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group(1))
+        json_match = re.search(r'\{.*\}', raw_response, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group(0))
+        raise ValueError("No JSON found in response")
+
+
+def shard_fallback(shard: str, error: Exception) -> Dict:
+    fallback = {field: FALLBACK_VALUES[field] for field in SHARDS[shard][0]}
+    if "detailed_feedback" in fallback:
+        fallback["detailed_feedback"] = f"Error processing evaluation: {str(error)}"
+    return fallback
+
+
+def shard_prompt(shard: str, job_role: str, interview_data: List[Dict]) -> str:
+    """The shard's evaluation request, without the reply format."""
+    fields = SHARDS[shard][0]
+    focus = "the overall picture" if shard == "narrative" else ", ".join(f.replace("_", " ") for f in fields)
+    return f"""
+        As an expert hiring manager, evaluate this candidate for a {job_role} position.
+        Focus only on {focus}.
+
+        Here are their interview responses:
+
+        {'-' * 40}
+        """ + "\n".join([
+            f"Q{i+1}: {response['question']}\n"
+            f"A: {response['response']}\n"
+            for i, response in enumerate(interview_data)
+        ]) + f"""
+        {'-' * 40}
+        """
+
+
+def shard_format(shard: str) -> str:
+    """Free-form reply instructions with the shard's JSON template."""
+    return f"""
+        Provide your answer in this exact JSON format:
+        {SHARDS[shard][1]}
+
+        Ensure your response is valid JSON and includes all fields.
+        """
+
+
+async def evaluate_shard(router, client, shard: str, job_role: str, interview_data: List[Dict],
+                         structured: Optional[StructuredSupport] = None) -> Dict:
+    """
+    Run one shard; on any failure return that shard's fallback values instead of raising.
+
+    With ``structured`` enabled the shard first asks for its own compact schema under its
+    SHARD_MAX_TOKENS cap, and falls back to the free-form template if that fails.
+    """
+    fields = SHARDS[shard][0]
+    prompt = shard_prompt(shard, job_role, interview_data)
+    if structured is not None and structured.enabled:
+        try:
+            response = await router.create_completion(
+                client, "evaluation",
+                [{"role": "user", "content": prompt + evaluation_instructions(fields)}],
+                **completion_options(f"evaluation_{shard}", evaluation_schema(fields),
+                                     max_tokens=SHARD_MAX_TOKENS[shard])
+            )
+            return decode_evaluation(response.choices[0].message.content, fields)
+        except Exception as e:
+            structured.failed(e)  # rejected schema or bad reply: use the free-form template
+    try:
+        response = await router.create_completion(
+            client, "evaluation",
+            [{"role": "user", "content": prompt + shard_format(shard)}]
+        )
+        evaluation = parse_json_object(response.choices[0].message.content)
+        return {field: evaluation.get(field, FALLBACK_VALUES[field]) for field in fields}
+    except Exception as e:
+        return shard_fallback(shard, e)
+
+
+async def evaluate_sharded(router, client, job_role: str, interview_data: List[Dict],
+                           structured: Optional[StructuredSupport] = None) -> Dict:
+    """
+    Evaluate an interview with all shards in flight at once.
+
+    Args:
+        router (ModelRouter): Routes each shard to the "evaluation" stage model
+        client (AsyncOpenAIClient): Client used for the calls
+        job_role (str): The position being interviewed for
+        interview_data (List[Dict]): List of question-response pairs
+        structured (StructuredSupport): Ask each shard for compact schema-constrained
+            JSON first, or None for free-form prompts only
+
+    Returns:
+        Dict: Evaluation with the same fields as InterviewEngine.evaluate_interview
+    """
+    results = await asyncio.gather(*(
+        evaluate_shard(router, client, shard, job_role, interview_data, structured) for shard in SHARDS
+    ))
+    evaluation = {}
+    for result in results:
+        evaluation.update(result)
+    # Same key order as the single-prompt evaluation
+    return {field: evaluation[field] for field in FALLBACK_VALUES}
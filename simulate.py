@@ -0,0 +1,130 @@
+"""
+Headless, concurrent replay of scripted interviews through the interview engine.
+This module reads (job_role, answers) scripts from a JSONL file, runs them as concurrent
+coroutines on one event loop, streams each result to an output JSONL file and reports
+throughput and stage latencies.
+
+Script lines look like:
+    {"job_role": "backend engineer", "answers": ["I built...", "I would...", ...]}
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+from interview_engine import AsyncOpenAIClient, InterviewEngine
+from model_router import ModelRouter
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+
+def read_scripts(path: str) -> Iterator[Dict]:
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            script = json.loads(line)
+            if not script.get("job_role"):
+                raise ValueError(f"{path}:{line_number}: script has no job_role")
+            script.setdefault("answers", [])
+            script.setdefault("id", line_number)
+            yield script
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percentile * (len(ordered) - 1))))]
+
+
+async def simulate(engine: InterviewEngine, scripts_path: str, output_path: str, concurrency: int = 64) -> Dict:
+    """
+    Replay every script concurrently and stream results to ``output_path``.
+
+    Args:
+        engine (InterviewEngine): Engine shared by all interviews
+        scripts_path (str): JSONL file of scripts
+        output_path (str): JSONL file results are written to as they finish
+        concurrency (int): Number of interviews in flight at the same time
+
+    Returns:
+        Dict: Summary with interview counts, interviews per minute and stage latencies
+    """
+    latencies = {"questions": [], "evaluation": [], "total": []}
+    failures = 0
+    start = time.monotonic()
+
+    def finish(task):
+        nonlocal failures
+        script = pending.pop(task)
+        try:
+            result = task.result()
+        except Exception as e:
+            failures += 1
+            result = {"job_role": script["job_role"], "error": str(e)}
+        else:
+            for stage, seconds in result["latency"].items():
+                latencies[stage].append(seconds)
+        result["script_id"] = script["id"]
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+    pending = {}
+    with open(output_path, "w") as out:
+        for script in read_scripts(scripts_path):
+            # Keep a bounded number in flight so huge script files are streamed, not loaded up front
+            if len(pending) >= concurrency:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    finish(task)
+            task = asyncio.create_task(engine.run_scripted_interview(script["job_role"], script["answers"]))
+            pending[task] = script
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                finish(task)
+
+    elapsed = time.monotonic() - start
+    completed = len(latencies["total"])
+    return {
+        "interviews": completed + failures,
+        "failures": failures,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 2),
+        "interviews_per_minute": round(60.0 * completed / elapsed, 2) if elapsed else 0.0,
+        "latency": {
+            stage: {
+                "mean": round(sum(values) / len(values), 3) if values else 0.0,
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+            }
+            for stage, values in latencies.items()
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay scripted interviews headlessly.")
+    parser.add_argument("scripts", help="JSONL file of {job_role, answers} scripts")
+    parser.add_argument("--output", default="simulation_results.jsonl", help="JSONL file for results")
+    parser.add_argument("--concurrency", "--workers", dest="concurrency", type=int, default=64,
+                        help="Interviews in flight at the same time")
+    parser.add_argument("--sharded-evaluation", action="store_true",
+                        help="Evaluate with concurrent per-dimension prompts")
+    parser.add_argument("--api-key", default=os.environ.get("GEMINI_API_KEY", ""))
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    args = parser.parse_args(argv)
+
+    client = AsyncOpenAIClient(args.api_key, args.base_url)
+    engine = InterviewEngine(client, ModelRouter.from_env(), sharded_evaluation=args.sharded_evaluation)
+    summary = asyncio.run(simulate(engine, args.scripts, args.output, concurrency=args.concurrency))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
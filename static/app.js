@@ -3,6 +3,27 @@ let questionIndex = 0;
 let mediaRecorder;
 let audioChunks = [];
 let conversation = [];
+// Persistent-connection mode: one WebSocket and one mic stream for the whole interview.
+// Falls back to the JSON endpoints when the socket cannot be opened.
+let socket = null;
+let micStream = null;
+// Question audio arrives one MP3 chunk per sentence and is played as a queue
+let questionChunks = [];
+let questionChunkIndex = 0;
+let questionAudioWaiting = false;
+// AudioWorklet capture: 16 kHz mono PCM, silence trimmed, stops itself after VAD.silenceMs.
+// Browsers without AudioWorklet fall back to MediaRecorder.
+const VAD = {
+  sampleRate: 16000,
+  silenceMs: 2000,       // silence after speech that ends the answer
+  keepSilenceMs: 300,    // silence kept before and after speech
+  thresholdFactor: 3,    // speech is this many times louder than the noise floor
+  minThreshold: 0.01,
+  autoSubmit: true       // submit as soon as the answer ends on silence
+};
+let audioContext = null;
+let vadRecorder = null;
+let answerBlob = null;
 
 const setupDiv = document.getElementById('setup');
 const interviewDiv = document.getElementById('interview');
@@ -28,31 +49,240 @@ function updateConversation() {
   }).join('');
 }
 
+function showQuestion(index, text) {
+  questionIndex = index;
+  conversation.push({type: 'question', index: questionIndex, text: text});
+  updateConversation();
+  questionText.textContent = text;
+  answerAudio.style.display = 'none';
+  submitBtn.disabled = true;
+}
+
+function showResult(result) {
+  interviewDiv.style.display = 'none';
+  resultDiv.style.display = '';
+  resultDiv.innerHTML = formatResult(result);
+  if (micStream) micStream.getTracks().forEach(track => track.stop());
+  micStream = null;
+  if (socket) socket.close();
+}
+
+function openInterviewSocket() {
+  return new Promise(resolve => {
+    if (!('WebSocket' in window)) return resolve(null);
+    const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+    const ws = new WebSocket(`${scheme}://${location.host}/ws/interview`);
+    ws.binaryType = 'arraybuffer';
+    ws.onopen = () => resolve(ws);
+    ws.onerror = () => resolve(null);
+  });
+}
+
+function playNextQuestionChunk() {
+  if (questionChunkIndex + 1 >= questionChunks.length) {
+    // Playback caught up with synthesis; resume when the next chunk lands
+    questionAudioWaiting = socket !== null;
+    return;
+  }
+  questionAudioWaiting = false;
+  questionChunkIndex += 1;
+  questionAudio.src = questionChunks[questionChunkIndex];
+  questionAudio.play();
+}
+
+questionAudio.onended = playNextQuestionChunk;
+
+function handleSocketMessage(event) {
+  if (event.data instanceof ArrayBuffer) {
+    questionChunks.push(URL.createObjectURL(new Blob([event.data], { type: 'audio/mpeg' })));
+    if (questionChunks.length === 1) {
+      questionAudio.src = questionChunks[0];
+    } else if (questionAudioWaiting) {
+      playNextQuestionChunk();
+    }
+    return;
+  }
+  const data = JSON.parse(event.data);
+  if (data.type === 'question') {
+    sessionId = data.session_id;
+    questionChunks = [];
+    questionChunkIndex = 0;
+    questionAudioWaiting = false;
+    conversation = conversation.filter(item => item.type !== 'status');
+    showQuestion(data.question_index, data.question_text);
+  } else if (data.type === 'question_audio_end') {
+    questionAudioWaiting = false;
+  } else if (data.type === 'transcript') {
+    conversation.push({type: 'answer', text: data.text});
+    updateConversation();
+  } else if (data.type === 'result') {
+    showResult(data.result);
+  } else if (data.type === 'error') {
+    alert(data.error);
+  }
+}
+
+function encodeWav(samples, sampleRate) {
+  const buffer = new ArrayBuffer(44 + samples.length * 2);
+  const view = new DataView(buffer);
+  const writeString = (offset, text) => {
+    for (let i = 0; i < text.length; i++) view.setUint8(offset + i, text.charCodeAt(i));
+  };
+  writeString(0, 'RIFF');
+  view.setUint32(4, 36 + samples.length * 2, true);
+  writeString(8, 'WAVE');
+  writeString(12, 'fmt ');
+  view.setUint32(16, 16, true);
+  view.setUint16(20, 1, true);             // PCM
+  view.setUint16(22, 1, true);             // mono
+  view.setUint32(24, sampleRate, true);
+  view.setUint32(28, sampleRate * 2, true);
+  view.setUint16(32, 2, true);
+  view.setUint16(34, 16, true);
+  writeString(36, 'data');
+  view.setUint32(40, samples.length * 2, true);
+  new Int16Array(buffer, 44).set(samples);
+  return new Blob([buffer], { type: 'audio/wav' });
+}
+
+class VadRecorder {
+  // onFrame(pcm) receives every 20 ms frame from the start of speech in order, pauses
+  // included as they happen, so the server's segmenter sees each pause (the final one
+  // too) while it is still going on; the recorded WAV trims long pauses. onAutoStop()
+  // fires when the answer ends on silence.
+  constructor(stream, onFrame, onAutoStop) {
+    this.stream = stream;
+    this.onFrame = onFrame;
+    this.onAutoStop = onAutoStop;
+    this.kept = [];
+    this.preRoll = [];
+    this.pendingSilence = [];
+    this.noiseFloor = null;
+    this.speaking = false;
+    this.stopped = false;
+  }
+
+  static supported() {
+    return !!(window.AudioContext && window.AudioWorkletNode);
+  }
+
+  async start() {
+    if (!audioContext) {
+      audioContext = new AudioContext();
+      await audioContext.audioWorklet.addModule('/static/recorder-worklet.js');
+    }
+    await audioContext.resume();
+    this.source = audioContext.createMediaStreamSource(this.stream);
+    this.node = new AudioWorkletNode(audioContext, 'pcm-downsampler', {
+      processorOptions: { targetRate: VAD.sampleRate }
+    });
+    this.node.port.onmessage = event => this.handleFrame(event.data.pcm, event.data.rms);
+    // A muted sink keeps the worklet pulled by the graph without playing the mic back
+    this.sink = audioContext.createGain();
+    this.sink.gain.value = 0;
+    this.source.connect(this.node).connect(this.sink).connect(audioContext.destination);
+  }
+
+  keep(frame) {
+    this.kept.push(frame);
+  }
+
+  handleFrame(pcm, rms) {
+    if (this.stopped) return;
+    const frameMs = pcm.length * 1000 / VAD.sampleRate;
+    const keepFrames = Math.ceil(VAD.keepSilenceMs / frameMs);
+    if (this.noiseFloor === null) this.noiseFloor = rms;
+    const threshold = Math.max(VAD.minThreshold, this.noiseFloor * VAD.thresholdFactor);
+    if (rms >= threshold) {
+      if (!this.speaking) {
+        // Speech started: keep a little of the silence before it
+        this.speaking = true;
+        this.preRoll.forEach(frame => { this.keep(frame); this.onFrame(frame); });
+        this.preRoll = [];
+      }
+      // The pause was already streamed; only the recording still needs it
+      this.pendingSilence.forEach(frame => this.keep(frame));
+      this.pendingSilence = [];
+      this.keep(pcm);
+      this.onFrame(pcm);
+      return;
+    }
+    // Track the noise floor only while nobody is talking
+    this.noiseFloor = 0.95 * this.noiseFloor + 0.05 * rms;
+    if (!this.speaking) {
+      this.preRoll.push(pcm);
+      if (this.preRoll.length > keepFrames) this.preRoll.shift();
+      return;
+    }
+    this.pendingSilence.push(pcm);
+    this.onFrame(pcm);
+    if (this.pendingSilence.length * frameMs >= VAD.silenceMs) {
+      this.stop();
+      this.onAutoStop();
+    }
+  }
+
+  // Returns the kept audio as a 16 kHz mono WAV blob, trailing silence trimmed
+  stop() {
+    if (!this.stopped) {
+      this.stopped = true;
+      const keepFrames = Math.ceil(VAD.keepSilenceMs / 20);
+      this.pendingSilence.slice(0, keepFrames).forEach(frame => this.keep(frame));
+      this.pendingSilence = [];
+      this.source.disconnect();
+      this.node.disconnect();
+      this.sink.disconnect();
+    }
+    const length = this.kept.reduce((total, frame) => total + frame.length, 0);
+    const samples = new Int16Array(length);
+    let offset = 0;
+    this.kept.forEach(frame => { samples.set(frame, offset); offset += frame.length; });
+    return encodeWav(samples, VAD.sampleRate);
+  }
+}
+
 document.getElementById('start-btn').onclick = async () => {
   const jobRole = document.getElementById('job-role').value.trim();
   if (!jobRole) return alert('Please enter a job role!');
+  conversation = [];
+  setupDiv.style.display = 'none';
+  interviewDiv.style.display = '';
+  resultDiv.style.display = 'none';
+  socket = await openInterviewSocket();
+  if (socket) {
+    socket.onmessage = handleSocketMessage;
+    socket.onclose = () => { socket = null; };
+    socket.send(JSON.stringify({ type: 'start', job_role: jobRole }));
+    return;
+  }
   const res = await fetch('/start_interview', {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify({ job_role: jobRole })
   });
   const data = await res.json();
-  if (data.error) return alert(data.error);
+  if (data.error) {
+    setupDiv.style.display = '';
+    interviewDiv.style.display = 'none';
+    return alert(data.error);
+  }
   sessionId = data.session_id;
-  questionIndex = data.question_index;
-  conversation = [{type: 'question', index: questionIndex, text: data.question_text}];
-  updateConversation();
-  questionText.textContent = data.question_text;
+  showQuestion(data.question_index, data.question_text);
   questionAudio.src = data.question_audio_url;
-  setupDiv.style.display = 'none';
-  interviewDiv.style.display = '';
-  resultDiv.style.display = 'none';
-  answerAudio.style.display = 'none';
-  submitBtn.disabled = true;
 };
 
+function answerRecorded(blob) {
+  answerBlob = blob;
+  recordBtn.disabled = false;
+  stopBtn.disabled = true;
+  answerAudio.src = URL.createObjectURL(blob);
+  answerAudio.style.display = '';
+  submitBtn.disabled = false;
+}
+
 recordBtn.onclick = async () => {
   audioChunks = [];
+  answerBlob = null;
   answerAudio.style.display = 'none';
   submitBtn.disabled = true;
   recordBtn.disabled = true;
@@ -60,17 +290,35 @@ recordBtn.onclick = async () => {
   conversation.push({type: 'status', text: 'Listening... (speak your response, I\'ll wait for you to finish)'});
   updateConversation();
   try {
-    const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
-    mediaRecorder = new MediaRecorder(stream);
-    mediaRecorder.start();
-    mediaRecorder.ondataavailable = e => audioChunks.push(e.data);
+    // Opened once and reused for every answer in the interview
+    if (!micStream) micStream = await navigator.mediaDevices.getUserMedia({ audio: true });
+    if (VadRecorder.supported()) {
+      if (socket) {
+        socket.send(JSON.stringify({ type: 'answer_start', format: 'pcm_s16le', sample_rate: VAD.sampleRate }));
+      }
+      vadRecorder = new VadRecorder(
+        micStream,
+        // Stream trimmed PCM up while the candidate is still talking
+        frame => { if (socket) socket.send(frame); },
+        () => {
+          answerRecorded(vadRecorder.stop());
+          if (VAD.autoSubmit) submitBtn.onclick();
+        }
+      );
+      await vadRecorder.start();
+      return;
+    }
+    mediaRecorder = new MediaRecorder(micStream);
+    if (socket) socket.send(JSON.stringify({ type: 'answer_start' }));
+    mediaRecorder.ondataavailable = e => {
+      audioChunks.push(e.data);
+      // Stream the answer up while the candidate is still talking
+      if (socket) socket.send(e.data);
+    };
     mediaRecorder.onstop = () => {
-      const audioBlob = new Blob(audioChunks, { type: 'audio/wav' });
-      answerAudio.src = URL.createObjectURL(audioBlob);
-      answerAudio.style.display = '';
-      submitBtn.disabled = false;
-      stream.getTracks().forEach(track => track.stop());
+      answerRecorded(new Blob(audioChunks, { type: mediaRecorder.mimeType || 'audio/webm' }));
     };
+    mediaRecorder.start(socket ? 250 : undefined);
   } catch (err) {
     alert('Microphone access denied or not supported.');
     recordBtn.disabled = false;
@@ -81,40 +329,60 @@ recordBtn.onclick = async () => {
 stopBtn.onclick = () => {
   recordBtn.disabled = false;
   stopBtn.disabled = true;
-  mediaRecorder.stop();
+  if (vadRecorder && !vadRecorder.stopped) {
+    answerRecorded(vadRecorder.stop());
+  } else if (mediaRecorder && mediaRecorder.state !== 'inactive') {
+    mediaRecorder.stop();
+  }
 };
 
+async function postWithRetry(url, body, attempts = 3) {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await fetch(url, { method: 'POST', body: body });
+    } catch (err) {
+      if (attempt >= attempts) throw err;
+      await new Promise(resolve => setTimeout(resolve, 500 * attempt));
+    }
+  }
+}
+
 submitBtn.onclick = async () => {
   submitBtn.disabled = true;
   conversation.push({type: 'status', text: 'Processing your response...'});
   updateConversation();
-  const audioBlob = new Blob(audioChunks, { type: 'audio/wav' });
+  if (socket) {
+    // Audio is already on the server; just close the answer
+    socket.send(JSON.stringify({ type: 'answer_end', question_index: questionIndex }));
+    return;
+  }
   const formData = new FormData();
   formData.append('session_id', sessionId);
   formData.append('question_index', questionIndex);
-  formData.append('audio', audioBlob, 'answer.wav');
-  const res = await fetch('/submit_answer', { method: 'POST', body: formData });
+  const extension = answerBlob.type.includes('wav') ? 'wav' : answerBlob.type.includes('ogg') ? 'ogg' : 'webm';
+  formData.append('audio', answerBlob, `answer.${extension}`);
+  // Safe to retry: the server deduplicates by session, question and audio content
+  const res = await postWithRetry('/submit_answer', formData);
   const data = await res.json();
+  if (data.error) {
+    conversation = conversation.filter(item => item.type !== 'status');
+    updateConversation();
+    submitBtn.disabled = false;
+    return alert(data.error);
+  }
+  // Remove status
+  conversation = conversation.filter(item => item.type !== 'status');
   // Show transcript
   if (data.transcript) {
     conversation.push({type: 'answer', text: data.transcript});
   }
   // Next question or result
   if (data.result) {
-    interviewDiv.style.display = 'none';
-    resultDiv.style.display = '';
-    resultDiv.innerHTML = formatResult(data.result);
+    showResult(data.result);
   } else {
-    questionIndex = data.question_index;
-    conversation.push({type: 'question', index: questionIndex, text: data.question_text});
-    updateConversation();
-    questionText.textContent = data.question_text;
+    showQuestion(data.question_index, data.question_text);
     questionAudio.src = data.question_audio_url;
-    answerAudio.style.display = 'none';
-    submitBtn.disabled = true;
   }
-  // Remove status
-  conversation = conversation.filter(item => item.type !== 'status');
   updateConversation();
 };
 
@@ -0,0 +1,48 @@
+// Downmixes microphone input to mono, resamples it to the target rate (16 kHz by default)
+// and posts 20 ms frames of 16-bit PCM, with their RMS level, to the main thread.
+class PcmDownsampler extends AudioWorkletProcessor {
+  constructor(options) {
+    super();
+    const targetRate = (options.processorOptions || {}).targetRate || 16000;
+    this.ratio = sampleRate / targetRate;
+    this.frameSize = Math.round(targetRate * 0.02);
+    this.frame = new Int16Array(this.frameSize);
+    this.filled = 0;
+    this.sumSquares = 0;
+    // Box filter: every output sample is the average of the input samples folded into it
+    this.acc = 0;
+    this.accCount = 0;
+    this.position = 0;
+  }
+
+  process(inputs) {
+    const input = inputs[0];
+    if (!input || input.length === 0) return true;
+    const channels = input.length;
+    const length = input[0].length;
+    for (let i = 0; i < length; i++) {
+      let sample = 0;
+      for (let c = 0; c < channels; c++) sample += input[c][i];
+      this.acc += sample / channels;
+      this.accCount++;
+      this.position += 1;
+      if (this.position < this.ratio) continue;
+      this.position -= this.ratio;
+      const value = Math.max(-1, Math.min(1, this.acc / this.accCount));
+      this.acc = 0;
+      this.accCount = 0;
+      this.sumSquares += value * value;
+      this.frame[this.filled++] = value * 0x7fff;
+      if (this.filled === this.frameSize) {
+        const rms = Math.sqrt(this.sumSquares / this.frameSize);
+        this.port.postMessage({ pcm: this.frame, rms: rms }, [this.frame.buffer]);
+        this.frame = new Int16Array(this.frameSize);
+        this.filled = 0;
+        this.sumSquares = 0;
+      }
+    }
+    return true;
+  }
+}
+
+registerProcessor('pcm-downsampler', PcmDownsampler);
@@ -0,0 +1,162 @@
+"""
+Compact structured-output mode for the interview prompts.
+This module defines short-key JSON schemas sent to the provider as the response format,
+per-stage completion caps, and the mapping from the compact wire keys back to the public
+field names used in results.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from model_router import is_request_error
+
+# Completion token caps per stage
+MAX_TOKENS = {
+    "questions": 300,
+    "evaluation": 700,
+}
+
+# Wire key -> public field name
+EVALUATION_WIRE_FIELDS = {
+    "o": "overall_score",
+    "t": "technical_competency",
+    "p": "problem_solving",
+    "c": "communication",
+    "e": "experience_level",
+    "f": "cultural_fit",
+    "s": "strengths",
+    "a": "areas_for_improvement",
+    "r": "hiring_recommendation",
+    "d": "detailed_feedback",
+}
+
+# Wire enum -> public hiring recommendation
+RECOMMENDATIONS = {
+    "strong_yes": "strong yes",
+    "yes": "yes",
+    "maybe": "maybe",
+    "no": "no",
+}
+
+_SCORE = {"type": "integer", "minimum": 1, "maximum": 10}
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+
+QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {"q": {"type": "array", "items": {"type": "string"}, "minItems": 5, "maxItems": 5}},
+    "required": ["q"],
+}
+
+_WIRE_PROPERTIES = {
+    "o": _SCORE, "t": _SCORE, "p": _SCORE, "c": _SCORE, "e": _SCORE, "f": _SCORE,
+    "s": _STRINGS,
+    "a": _STRINGS,
+    "r": {"type": "string", "enum": list(RECOMMENDATIONS)},
+    "d": {"type": "string"},
+}
+
+_WIRE_DESCRIPTIONS = {
+    "o": "overall score (integer 1-10)",
+    "t": "technical competency (integer 1-10)",
+    "p": "problem solving (integer 1-10)",
+    "c": "communication (integer 1-10)",
+    "e": "experience level (integer 1-10)",
+    "f": "cultural fit (integer 1-10)",
+    "s": "strengths (list)",
+    "a": "areas for improvement (list)",
+    "r": 'hiring recommendation ("strong_yes", "yes", "maybe" or "no")',
+    "d": "detailed feedback (at most 120 words)",
+}
+
+
+def _wire_keys(fields: Optional[List[str]]) -> List[str]:
+    return [key for key, field in EVALUATION_WIRE_FIELDS.items() if fields is None or field in fields]
+
+
+def evaluation_schema(fields: Optional[List[str]] = None) -> Dict:
+    """Compact evaluation schema for the given public fields (all of them by default)."""
+    keys = _wire_keys(fields)
+    return {
+        "type": "object",
+        "properties": {key: _WIRE_PROPERTIES[key] for key in keys},
+        "required": keys,
+    }
+
+
+def evaluation_instructions(fields: Optional[List[str]] = None) -> str:
+    """Prompt suffix naming the compact keys for the given public fields."""
+    return ("Reply with JSON only, using these keys: "
+            + ", ".join(f"{key}={_WIRE_DESCRIPTIONS[key]}" for key in _wire_keys(fields)) + ".")
+
+
+EVALUATION_SCHEMA = evaluation_schema()
+
+QUESTIONS_INSTRUCTIONS = 'Reply with JSON only: {"q": [5 short questions]}.'
+
+EVALUATION_INSTRUCTIONS = evaluation_instructions()
+
+
+class StructuredSupport:
+    """
+    Remembers whether the provider accepts schema-constrained requests.
+
+    A provider that does not support ``response_format`` (or ``max_tokens``) rejects
+    the request with a 400; after the first rejection the structured prompts are
+    skipped, so later calls go straight to the free-form prompt instead of paying a
+    failed round trip every time.
+
+    Attributes:
+        enabled (bool): Whether structured requests should still be tried
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def failed(self, error: Exception):
+        """Note a failed structured call; turns the mode off if the provider rejected it."""
+        if is_request_error(error):
+            self.enabled = False
+
+
+def completion_options(stage: str, schema: Dict, max_tokens: Optional[int] = None) -> Dict:
+    """
+    Extra chat-completion arguments for a stage: the JSON schema response format and
+    the output cap (the stage's MAX_TOKENS entry unless ``max_tokens`` is given).
+    """
+    return {
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": f"interview_{stage}", "schema": schema},
+        },
+        "max_tokens": max_tokens or MAX_TOKENS[stage],
+    }
+
+
+def decode_questions(raw_response: str) -> List[str]:
+    questions = json.loads(raw_response)["q"]
+    if len(questions) < 5:
+        raise ValueError("Not enough questions generated")
+    return questions[:5]
+
+
+def decode_evaluation(raw_response: str, fields: Optional[List[str]] = None) -> Dict:
+    """
+    Map a compact evaluation reply back to the public evaluation fields.
+
+    Args:
+        raw_response (str): Model reply
+        fields (List[str]): Public fields the reply must contain (all of them by default)
+
+    Raises:
+        ValueError: If the reply is not valid JSON or misses a field
+    """
+    wire = json.loads(raw_response)
+    keys = _wire_keys(fields)
+    missing = [key for key in keys if key not in wire]
+    if missing:
+        raise ValueError(f"Structured evaluation missing fields: {missing}")
+    evaluation = {EVALUATION_WIRE_FIELDS[key]: wire[key] for key in keys}
+    if "hiring_recommendation" in evaluation:
+        evaluation["hiring_recommendation"] = RECOMMENDATIONS.get(
+            evaluation["hiring_recommendation"], evaluation["hiring_recommendation"])
+    return evaluation
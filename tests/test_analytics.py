@@ -0,0 +1,36 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from analytics import MISSING, EvaluationTable
+
+
+def write_result(result_dir, name, job_role, recommendation):
+    evaluation = {"overall_score": 5}
+    if recommendation is not None:
+        evaluation["hiring_recommendation"] = recommendation
+    with open(os.path.join(result_dir, f"interview_results_{name}.json"), "w") as f:
+        json.dump({"job_role": job_role, "evaluation": evaluation}, f)
+
+
+def test_recommendations_are_encoded_from_the_data(tmp_path):
+    write_result(tmp_path, "1", "Python", "Strong No")
+    write_result(tmp_path, "2", "python", "yes")
+    write_result(tmp_path, "3", "Cleaner", None)
+    table = EvaluationTable.load(str(tmp_path))
+
+    assert table.recommendations == ["strong no", "yes"]
+    assert table.recommendation_codes.tolist() == [0, 1, MISSING]
+    assert table.recommendation_rates() == {"python": {"strong no": 0.5, "yes": 0.5}}
+    assert table.report()["missing_recommendations"] == 1
+
+
+def test_npz_round_trip_keeps_recommendations(tmp_path):
+    write_result(tmp_path, "1", "Python", "strong no")
+    path = str(tmp_path / "evaluations.npz")
+    EvaluationTable.load(str(tmp_path)).export(path)
+    table = EvaluationTable.from_npz(path)
+
+    assert table.recommendation_rates() == {"python": {"strong no": 1.0}}
@@ -0,0 +1,92 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+for module in ("flask", "flask_cors", "gtts", "speech_recognition"):
+    pytest.importorskip(module)
+
+import speech_recognition as sr
+
+import app
+from result_store import ResultWriter
+from score_index import ScoreIndex
+from session_store import InterviewSession
+
+
+class FakeInterviewAI:
+    """Transcribes every file as a fixed answer; ``failures`` STT errors come first."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.transcriptions = 0
+
+    def transcribe(self, source, on_partial=None):
+        self.transcriptions += 1
+        if self.failures:
+            self.failures -= 1
+            raise sr.RequestError("service down")
+        return "I would profile it first and then fix the hot path with a cache and measurements"
+
+    def evaluate_interview(self, job_role, interview_data):
+        return {"overall_score": 7, "hiring_recommendation": "yes"}
+
+
+@pytest.fixture
+def web(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "ADAPTIVE_FOLLOW_UPS", False)
+    monkeypatch.setattr(app, "STREAMING_TTS", True)
+    monkeypatch.setattr(app, "interview_ai", FakeInterviewAI())
+    monkeypatch.setattr(app, "result_writer", ResultWriter(str(tmp_path)))
+    monkeypatch.setattr(app, "score_index", ScoreIndex(str(tmp_path)))
+    monkeypatch.setattr(app, "submissions", app.RequestDeduplicator())
+    return app
+
+
+def start(web, questions):
+    return web.sessions.add(InterviewSession("Engineer", list(questions)))
+
+
+def test_retry_of_the_same_answer_is_replayed(web):
+    session = start(web, ["Q1", "Q2"])
+    first = web.process_answer(session.session_id, 0, "digest-a", "answer.wav")
+    again = web.process_answer(session.session_id, 0, "digest-a", "answer.wav")
+
+    assert first == again
+    assert first[1] == 200
+    assert web.interview_ai.transcriptions == 1
+    assert session.current_index == 1
+
+
+def test_different_answer_for_an_answered_question_is_a_conflict(web):
+    session = start(web, ["Q1", "Q2"])
+    web.process_answer(session.session_id, 0, "digest-a", "answer.wav")
+    payload, status = web.process_answer(session.session_id, 0, "digest-b", "answer.wav")
+
+    assert status == 409
+    assert payload["question_index"] == 1
+
+
+def test_retry_after_the_session_is_removed_gets_the_result(web):
+    session = start(web, ["Q1"])
+    payload, status = web.process_answer(session.session_id, 0, "digest-a", "answer.wav")
+    assert status == 200 and "result" in payload
+    assert web.sessions.get(session.session_id) is None
+
+    assert web.process_answer(session.session_id, 0, "digest-a", "answer.wav") == (payload, status)
+    assert web.process_answer(session.session_id, 0, "digest-b", "answer.wav")[1] == 400
+
+
+def test_stt_failure_is_not_cached_and_does_not_advance(web, monkeypatch):
+    monkeypatch.setattr(web, "interview_ai", FakeInterviewAI(failures=1))
+    session = start(web, ["Q1", "Q2"])
+
+    payload, status = web.process_answer(session.session_id, 0, "digest-a", "answer.wav")
+    assert status == 503
+    assert session.current_index == 0 and session.answers == []
+
+    payload, status = web.process_answer(session.session_id, 0, "digest-a", "answer.wav")
+    assert status == 200
+    assert session.current_index == 1
@@ -0,0 +1,112 @@
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import speech_recognition as sr
+
+from background_listener import BackgroundListener
+
+SAMPLE_RATE = 16000
+CHUNK = 320  # 20 ms
+WORDS = ["one", "two", "three"]
+
+
+class ScriptedMicrophone(sr.AudioSource):
+    """
+    Plays a script of (seconds, sentence index or None for silence) in real time.
+    A sentence is loud 16-bit samples whose value encodes its index.
+    """
+
+    SAMPLE_RATE = SAMPLE_RATE
+    SAMPLE_WIDTH = 2
+    CHUNK = CHUNK
+
+    def __init__(self, script):
+        self.script = script
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = self
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.stream = None
+
+    def read(self, size):
+        time.sleep(size / SAMPLE_RATE)
+        elapsed = time.monotonic() - self.started
+        for seconds, sentence in self.script:
+            if elapsed < seconds:
+                break
+            elapsed -= seconds
+        else:
+            sentence = None
+        sample = 0 if sentence is None else 10000 + sentence
+        return struct.pack("<h", sample) * size
+
+
+class FakeRecognizer:
+    """Phrase capture like sr.Recognizer.listen: starts on loud audio, ends after pause_threshold of silence."""
+
+    def __init__(self):
+        self.energy_threshold = 300
+        self.dynamic_energy_threshold = False
+        self.pause_threshold = 0.8
+        self.non_speaking_duration = 0.5
+
+    def adjust_for_ambient_noise(self, source, duration=1):
+        pass
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        assert isinstance(source, sr.AudioSource)
+        seconds_per_chunk = source.CHUNK / source.SAMPLE_RATE
+        waited = 0.0
+        while True:
+            chunk = source.stream.read(source.CHUNK)
+            if struct.unpack("<h", chunk[:2])[0]:
+                break
+            waited += seconds_per_chunk
+            if timeout and waited > timeout:
+                raise sr.WaitTimeoutError()
+        frames, silent = [chunk], 0.0
+        while silent < self.pause_threshold:
+            chunk = source.stream.read(source.CHUNK)
+            frames.append(chunk)
+            silent = 0.0 if struct.unpack("<h", chunk[:2])[0] else silent + seconds_per_chunk
+        return sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def recognize_google(self, audio):
+        return WORDS[struct.unpack("<h", audio.frame_data[:2])[0] - 10000]
+
+
+def run_answer(script, end_pause):
+    listener = BackgroundListener(FakeRecognizer(), ScriptedMicrophone(script), end_pause=end_pause, calibration=0)
+    listener.start()
+    try:
+        return listener.listen_answer()
+    finally:
+        listener.stop()
+
+
+def test_answer_spans_phrases_longer_than_the_end_pause():
+    # Each sentence takes longer to capture than end_pause minus the phrase's trailing pause
+    script = [(0.2, None), (0.8, 0), (0.7, None), (0.8, 1), (0.7, None), (0.8, 2)]
+    assert run_answer(script, end_pause=1.0) == "one two three"
+
+
+def test_answer_ends_after_end_pause_of_silence():
+    script = [(0.2, None), (0.4, 0), (1.5, None), (0.4, 1)]
+    assert run_answer(script, end_pause=1.0) == "one"
+
+
+def test_stop_interrupts_a_long_phrase():
+    listener = BackgroundListener(FakeRecognizer(), ScriptedMicrophone([(60, 0)]), calibration=0)
+    listener.start()
+    time.sleep(0.2)
+    started = time.monotonic()
+    listener.stop()
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from follow_up import SpeculativeFollowUp
+
+
+class Drafts:
+    """submit() stand-in that records each generation and completes it on demand."""
+
+    def __init__(self):
+        self.futures = {}
+
+    def submit(self, answer):
+        future = Future()
+        self.futures[answer] = future
+        return future
+
+    def finish(self, answer):
+        self.futures[answer].set_result(f"follow-up for: {answer}")
+
+
+def test_final_answer_extending_a_draft_reuses_it():
+    drafts = Drafts()
+    speculation = SpeculativeFollowUp(drafts.submit, "Tell me about a project")
+    speculation.update("I built a")
+    drafts.finish("I built a")
+    speculation.update("I built a cache")
+    drafts.finish("I built a cache")
+
+    assert speculation.resolve("I built a cache for our API") == "follow-up for: I built a cache"
+    assert list(drafts.futures) == ["I built a", "I built a cache"]
+
+
+def test_running_draft_is_awaited_instead_of_regenerated():
+    drafts = Drafts()
+    speculation = SpeculativeFollowUp(drafts.submit, "Tell me about a project")
+    speculation.update("I built a cache")
+
+    threading.Timer(0.05, drafts.finish, ["I built a cache"]).start()
+    assert speculation.resolve("I built a cache for our API", timeout=5) == "follow-up for: I built a cache"
+    assert list(drafts.futures) == ["I built a cache"]
+
+
+def test_unrelated_final_answer_generates_fresh():
+    drafts = Drafts()
+    speculation = SpeculativeFollowUp(drafts.submit, "Tell me about a project")
+    speculation.update("I built a cash")
+    drafts.finish("I built a cash")
+
+    future = Future()
+    future.set_result("fresh")
+    speculation.submit = lambda answer: future
+    assert speculation.resolve("I built a cache") == "fresh"
@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from idempotency import RequestDeduplicator, answer_digest, submission_key
+
+
+def test_same_key_in_flight_runs_once():
+    deduplicator = RequestDeduplicator()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"n": len(calls)}, 200
+
+    responses = []
+    first = threading.Thread(target=lambda: responses.append(deduplicator.run("k", work)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: responses.append(deduplicator.run("k", work)))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == [1]
+    assert responses == [({"n": 1}, 200), ({"n": 1}, 200)]
+
+
+def test_same_key_after_completion_is_cached():
+    deduplicator = RequestDeduplicator()
+    calls = []
+
+    def work():
+        calls.append(1)
+        return {"n": len(calls)}, 200
+
+    assert deduplicator.run("k", work) == ({"n": 1}, 200)
+    assert deduplicator.run("k", work) == ({"n": 1}, 200)
+    assert deduplicator.run("other", work) == ({"n": 2}, 200)
+
+
+def test_failures_are_not_cached():
+    deduplicator = RequestDeduplicator()
+    outcomes = [RuntimeError("boom"), ({"error": "busy"}, 503), ({"ok": True}, 200)]
+
+    def work():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError):
+        deduplicator.run("k", work)
+    assert deduplicator.run("k", work) == ({"error": "busy"}, 503)
+    assert deduplicator.run("k", work) == ({"ok": True}, 200)
+    assert deduplicator.run("k", work) == ({"ok": True}, 200)
+
+
+def test_submission_key_uses_the_streamed_digest():
+    digest = answer_digest()
+    digest.update(b"first half ")
+    digest.update(b"second half")
+    whole = answer_digest()
+    whole.update(b"first half second half")
+
+    assert submission_key("s", 0, digest.hexdigest()) == submission_key("s", 0, whole.hexdigest())
+    assert submission_key("s", 0, digest.hexdigest()) != submission_key("s", 1, digest.hexdigest())
@@ -0,0 +1,32 @@
+import asyncio
+import os
+import sys
+from types import ModuleType, SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from interview_engine import AsyncOpenAIClient
+
+
+class FakeAsyncOpenAI:
+    """Stands in for openai.AsyncOpenAI: refuses to run on a loop other than its own."""
+
+    def __init__(self, api_key, base_url):
+        self.loop = asyncio.get_running_loop()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, **kwargs):
+        if asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("Event loop is closed")
+        return model
+
+
+def test_client_survives_consecutive_event_loops(monkeypatch):
+    openai = ModuleType("openai")
+    openai.AsyncOpenAI = FakeAsyncOpenAI
+    monkeypatch.setitem(sys.modules, "openai", openai)
+    client = AsyncOpenAIClient("key", "https://example.invalid/")
+
+    # One asyncio.run per console interview
+    assert asyncio.run(client.create_completion("m1", [])) == "m1"
+    assert asyncio.run(client.create_completion("m2", [])) == "m2"
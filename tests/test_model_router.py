@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from model_router import ModelRouter
+
+
+class FailingClient:
+    async def create_completion(self, model, messages, **kwargs):
+        raise RuntimeError("boom")
+
+
+def test_slow_stage_does_not_trip_other_stages():
+    router = ModelRouter()
+    # Evaluations well within their 15 s SLO, then one fast question call
+    for _ in range(5):
+        router.record("evaluation", "gemini-2.0-flash-exp", 8.0, ok=True)
+    router.record("questions", "gemini-2.0-flash-exp", 0.5, ok=True)
+
+    assert router.select("evaluation") == "gemini-2.0-flash-exp"
+    assert router.select("questions") == "gemini-2.0-flash-exp"
+
+
+def test_slo_breach_only_moves_that_stage():
+    router = ModelRouter()
+    for _ in range(5):
+        router.record("questions", "gemini-2.0-flash-exp", 8.0, ok=True)
+
+    assert router.select("questions") == "gemini-2.0-flash-lite"
+    assert router.select("evaluation") == "gemini-2.0-flash-exp"
+
+
+def test_cooldown_probes_model_again():
+    router = ModelRouter(cooldown=0)
+    for _ in range(5):
+        router.record("questions", "gemini-2.0-flash-exp", 8.0, ok=True)
+
+    assert router.select("questions") == "gemini-2.0-flash-exp"
+    assert router.stats()["questions"]["gemini-2.0-flash-exp"]["calls"] == 0
+
+
+def test_errors_are_recorded_per_stage():
+    router = ModelRouter()
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            asyncio.run(router.create_completion(FailingClient(), "evaluation", []))
+
+    stats = router.stats()
+    assert stats["evaluation"]["gemini-2.0-flash-exp"]["error_rate"] == 1.0
+    assert "questions" not in stats
+    assert router.select("evaluation") == "gemini-2.0-flash"
+    assert router.select("questions") == "gemini-2.0-flash-exp"
+
+
+class RejectingClient:
+    async def create_completion(self, model, messages, **kwargs):
+        error = RuntimeError("response_format is not supported")
+        error.status_code = 400
+        raise error
+
+
+def test_request_errors_do_not_count_against_the_model():
+    router = ModelRouter()
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            asyncio.run(router.create_completion(RejectingClient(), "evaluation", []))
+
+    assert router.stats() == {}
+    assert router.select("evaluation") == "gemini-2.0-flash-exp"
@@ -0,0 +1,75 @@
+import json
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import result_store
+from result_store import ResultWriter
+
+
+def test_batch_sync_writes_every_result(tmp_path):
+    writer = ResultWriter(str(tmp_path), batch_sync=True)
+    paths = [writer.save({"n": n}) for n in range(20)]
+
+    assert writer.flush() == []
+    assert [json.load(open(path))["n"] for path in paths] == list(range(20))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    writer.close()
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    write_temp = result_store._write_temp
+    calls = []
+
+    def flaky(path, data, sync):
+        calls.append(path)
+        if len(calls) == 1:
+            raise OSError("disk hiccup")
+        return write_temp(path, data, sync)
+
+    monkeypatch.setattr(result_store, "_write_temp", flaky)
+    writer = ResultWriter(str(tmp_path), retry_delay=0)
+    path = writer.save({"ok": True})
+
+    assert writer.flush() == []
+    assert len(calls) == 2
+    assert json.load(open(path)) == {"ok": True}
+    writer.close()
+
+
+def test_write_that_keeps_failing_is_reported(tmp_path):
+    result_dir = tmp_path / "Result"
+    errors = []
+    writer = ResultWriter(str(result_dir), max_retries=2, retry_delay=0,
+                          on_error=lambda path, error: errors.append(path))
+    shutil.rmtree(result_dir)
+    path = writer.save({"lost": True})
+
+    failures = writer.flush()
+    assert [failed_path for failed_path, _ in failures] == [path]
+    assert errors == [path]
+    assert writer.flush() == []
+    writer.close()
+
+
+def test_batch_sync_failure_only_fails_that_file(tmp_path, monkeypatch):
+    fsync_file = result_store._fsync_file
+    synced = []
+
+    def fsync_once_broken(path):
+        synced.append(path)
+        if len(synced) == 1:
+            os.remove(path)  # The temp file is gone, so discarding it must not raise
+            raise OSError("fsync failed")
+        fsync_file(path)
+
+    monkeypatch.setattr(result_store, "_fsync_file", fsync_once_broken)
+    writer = ResultWriter(str(tmp_path), batch_sync=True, max_retries=0)
+    paths = [writer.save({"n": n}) for n in range(2)]
+
+    failures = writer.flush()
+    assert [path for path, _ in failures] == paths[:1]
+    assert json.load(open(paths[1])) == {"n": 1}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
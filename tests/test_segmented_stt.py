@@ -0,0 +1,65 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+import segmented_stt
+from segmented_stt import SegmentTranscriber
+
+
+class BlockingRecognizer:
+    energy_threshold = 300
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def recognize_google(self, audio):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return "text"
+
+
+def test_close_cancels_queued_segments():
+    recognizer = BlockingRecognizer()
+    transcriber = SegmentTranscriber(recognizer, workers=1, max_in_flight=3)
+    for _ in range(3):
+        transcriber.submit(object())
+    recognizer.started.wait(5)
+    transcriber.close()
+    recognizer.release.set()
+
+    assert [future.cancelled() for future in transcriber._futures] == [False, True, True]
+    assert recognizer.calls == 1
+    transcriber.close()  # Idempotent
+
+
+def test_unreadable_file_closes_the_transcriber(monkeypatch):
+    closed = []
+
+    class TrackedTranscriber(SegmentTranscriber):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    class UnreadableFile:
+        def __init__(self, path):
+            pass
+
+        def __enter__(self):
+            raise ValueError("Audio file could not be read as PCM WAV")
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(segmented_stt, "SegmentTranscriber", TrackedTranscriber)
+    monkeypatch.setattr(segmented_stt.sr, "AudioFile", UnreadableFile)
+    with pytest.raises(ValueError):
+        segmented_stt.transcribe_file("answer.webm", recognizer=BlockingRecognizer())
+
+    assert len(closed) == 1
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from interview_engine import InterviewEngine
+from model_router import ModelRouter
+from sharded_evaluation import SHARD_MAX_TOKENS, SHARDS
+from structured_output import decode_evaluation, evaluation_schema
+
+
+def reply(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class NoSchemaClient:
+    """Provider that rejects response_format and answers free-form prompts."""
+
+    def __init__(self):
+        self.structured_calls = 0
+
+    async def create_completion(self, model, messages, **kwargs):
+        if "response_format" in kwargs:
+            self.structured_calls += 1
+            error = RuntimeError("response_format is not supported")
+            error.status_code = 400
+            raise error
+        return reply(json.dumps(["q1", "q2", "q3", "q4", "q5"]))
+
+
+class ShardClient:
+    """Provider that answers every structured shard with its compact keys."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def create_completion(self, model, messages, **kwargs):
+        schema = kwargs["response_format"]["json_schema"]["schema"]
+        self.calls.append((sorted(schema["required"]), kwargs["max_tokens"]))
+        values = {"s": ["clear"], "a": ["depth"], "r": "strong_yes", "d": "Good."}
+        return reply(json.dumps({key: values.get(key, 7) for key in schema["required"]}))
+
+
+def test_rejected_schema_is_remembered():
+    client = NoSchemaClient()
+    engine = InterviewEngine(client, ModelRouter(), structured_output=True)
+    for _ in range(3):
+        assert asyncio.run(engine.generate_questions("Engineer")) == ["q1", "q2", "q3", "q4", "q5"]
+
+    assert client.structured_calls == 1
+    assert not engine.structured.enabled
+
+
+def test_shards_use_their_own_schema_and_cap():
+    client = ShardClient()
+    engine = InterviewEngine(client, ModelRouter(), sharded_evaluation=True, structured_output=True)
+    evaluation = asyncio.run(engine.evaluate_interview("Engineer", [{"question": "Q", "response": "A"}]))
+
+    assert sorted(client.calls) == sorted(
+        (sorted(evaluation_schema(fields)["required"]), SHARD_MAX_TOKENS[shard])
+        for shard, (fields, _) in SHARDS.items()
+    )
+    assert evaluation["technical_competency"] == 7
+    assert evaluation["hiring_recommendation"] == "strong yes"
+
+
+def test_decode_subset_of_fields():
+    assert decode_evaluation('{"t": 6, "p": 8}', ["technical_competency", "problem_solving"]) == {
+        "technical_competency": 6, "problem_solving": 8,
+    }